@@ -1,25 +1,110 @@
 """
 Cartesia API service for voice and model management.
 """
+import functools
+import importlib.util
 import logging
 import os
+import threading
+import time
 import warnings
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from app.config import settings
+from app.utils.cartesia_utils import build_cartesia_client
 
 logger = logging.getLogger(__name__)
 
-# Suppress Pydantic V1 compatibility warning with Python 3.14+
-warnings.filterwarnings("ignore", message=".*Core Pydantic V1 functionality isn't compatible with Python 3.14.*", category=UserWarning)
-
-try:
-    from cartesia import Cartesia
-    CARTESIA_AVAILABLE = True
-except ImportError:
-    CARTESIA_AVAILABLE = False
+# The SDK is only imported when a client is actually needed, so requests that
+# never touch TTS don't pay for it at startup.
+CARTESIA_AVAILABLE = importlib.util.find_spec("cartesia") is not None
+if not CARTESIA_AVAILABLE:
     logger.warning("Cartesia Python SDK not installed. Install with: pip install cartesia")
 
 
+# Seconds before the cached SDK voice list is refreshed in the background
+_VOICES_TTL = 300
+
+
+@functools.cache
+def _get_cartesia_cls():
+    """Import and return the Cartesia SDK client class on first use."""
+    # Suppress the SDK's Pydantic V1 compatibility warning (Python 3.14+) for this import only
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*Core Pydantic V1 functionality isn't compatible with Python 3.14.*", category=UserWarning)
+        from cartesia import Cartesia
+    return Cartesia
+
+
+# Known Cartesia TTS models (documented, not exposed via the API)
+_MODELS: Tuple[Dict[str, Any], ...] = (
+    {
+        "id": "sonic-3",
+        "name": "Sonic 3",
+        "description": "Latest streaming TTS model with high naturalness and accurate transcript following",
+        "languages": ["en", "fr", "de", "es", "pt", "zh", "ja", "hi", "it", "ko", "nl", "pl", "ru", "sv", "tr", "tl", "bg", "ro", "ar", "cs", "el", "fi", "hr", "ms", "sk", "da", "ta", "uk", "hu", "no", "vi", "bn", "th", "he", "ka", "id", "te", "gu", "kn", "ml", "mr", "pa"],
+        "features": ["volume_control", "speed_control", "emotion_control", "laughter_tags"]
+    },
+    {
+        "id": "sonic-3-2025-10-27",
+        "name": "Sonic 3 (2025-10-27)",
+        "description": "Pinned snapshot of Sonic 3 from October 27, 2025",
+        "languages": ["en", "fr", "de", "es", "pt", "zh", "ja", "hi", "it", "ko", "nl", "pl", "ru", "sv", "tr", "tl", "bg", "ro", "ar", "cs", "el", "fi", "hr", "ms", "sk", "da", "ta", "uk", "hu", "no", "vi", "bn", "th", "he", "ka", "id", "te", "gu", "kn", "ml", "mr", "pa"],
+        "features": ["volume_control", "speed_control", "emotion_control", "laughter_tags"]
+    }
+)
+
+
+# Curated list of known Cartesia voices, used when the SDK cannot list voices.
+# Based on Cartesia documentation.
+_FALLBACK_VOICES: Tuple[Dict[str, Any], ...] = (
+    {
+        "id": "98a34ef2-2140-4c28-9c71-663dc4dd7022",
+        "name": "Tessa",
+        "language": "en",
+        "gender": "female",
+        "tags": ["Emotive", "Expressive"],
+        "description": "Expressive American English voice, great for emotive characters"
+    },
+    {
+        "id": "c961b81c-a935-4c17-bfb3-ba2239de8c2f",
+        "name": "Kyle",
+        "language": "en",
+        "gender": "male",
+        "tags": ["Emotive", "Expressive"],
+        "description": "Expressive American English voice, great for emotive characters"
+    },
+    {
+        "id": "f786b574-daa5-4673-aa0c-cbe3e8534c02",
+        "name": "Katie",
+        "language": "en",
+        "gender": "female",
+        "tags": ["Stable", "Realistic"],
+        "description": "Stable, realistic American English voice, great for voice agents"
+    },
+    {
+        "id": "228fca29-3a0a-435c-8728-5cb483251068",
+        "name": "Kiefer",
+        "language": "en",
+        "gender": "male",
+        "tags": ["Stable", "Realistic"],
+        "description": "Stable, realistic American English voice, great for voice agents"
+    },
+    {
+        "id": "6ccbfb76-1fc6-48f7-b71d-91ac6298247b",
+        "name": "Tessa (Alternative)",
+        "language": "en",
+        "gender": "female",
+        "tags": ["Emotive"],
+        "description": "Emotive American English voice"
+    }
+)
+
+# Lowercased tag sets for the fallback voices, aligned with _FALLBACK_VOICES
+_FALLBACK_VOICE_TAGS: Tuple[frozenset, ...] = tuple(
+    frozenset(tag.lower() for tag in voice["tags"]) for voice in _FALLBACK_VOICES
+)
+
+
 class CartesiaAPIService:
     """Service for interacting with Cartesia API endpoints."""
     
@@ -38,17 +123,37 @@ class CartesiaAPIService:
                 "Please set CARTESIA_API_KEY in your .env file or environment variables."
             )
         
-        try:
-            self.client = Cartesia(api_key=self.api_key)
-            logger.info("CartesiaAPIService initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Cartesia client: {e}", exc_info=True)
-            raise
+        self._client = None
+        
+        # Stale-while-revalidate cache of the SDK voice list
+        self._voices_cache: Optional[List[Tuple[Dict[str, Any], frozenset]]] = None
+        self._voices_fetched_at = 0.0
+        self._voices_refreshing = False
+        self._voices_lock = threading.Lock()
+        logger.info("CartesiaAPIService initialized successfully")
+    
+    @property
+    def client(self):
+        """Cartesia SDK client, constructed on first access."""
+        if self._client is None:
+            try:
+                self._client = self._build_client()
+            except Exception as e:
+                logger.error(f"Failed to initialize Cartesia client: {e}", exc_info=True)
+                raise
+        return self._client
+    
+    def _build_client(self):
+        """Create the SDK client on the process-wide pooled httpx client."""
+        return build_cartesia_client(_get_cartesia_cls(), self.api_key)
     
     def list_voices(self, language: Optional[str] = None, tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         List available Cartesia voices.
         
+        The SDK voice list is cached for _VOICES_TTL seconds. Once stale, the cached
+        list keeps being served while a background thread refreshes it.
+        
         Args:
             language: Optional language filter (e.g., 'en', 'fr')
             tags: Optional list of tags to filter by (e.g., ['Emotive', 'Stable'])
@@ -56,44 +161,103 @@ class CartesiaAPIService:
         Returns:
             List of voice dictionaries with id, name, language, tags, etc.
         """
+        lang_lower = language.lower() if language else None
+        requested_tags = frozenset(tag.strip().lower() for tag in tags) if tags else frozenset()
+        
         try:
-            # Try using the Cartesia SDK if it has a voices method
-            # If not available, fall back to known voices
-            if hasattr(self.client, 'voices') and hasattr(self.client.voices, 'list'):
-                try:
-                    voices_response = self.client.voices.list()
-                    voices = []
-                    # Convert SDK response to our format
-                    if hasattr(voices_response, 'data'):
-                        for voice in voices_response.data:
-                            voice_dict = {
-                                "id": getattr(voice, 'id', ''),
-                                "name": getattr(voice, 'name', ''),
-                                "language": getattr(voice, 'language', 'en'),
-                                "tags": getattr(voice, 'tags', []),
-                                "description": getattr(voice, 'description', '')
-                            }
-                            # Apply filters
-                            if language and voice_dict.get("language") != language:
-                                continue
-                            if tags and not any(tag in voice_dict.get("tags", []) for tag in tags):
-                                continue
-                            voices.append(voice_dict)
-                    
-                    if voices:
-                        logger.info(f"Retrieved {len(voices)} voices from Cartesia SDK")
-                        return voices
-                except Exception as sdk_error:
-                    logger.warning(f"Cartesia SDK voices.list() failed: {sdk_error}, using fallback")
+            catalogue = self._get_voice_catalogue()
+            if catalogue:
+                voices = self._filter_voices(catalogue, lang_lower, requested_tags)
+                if voices:
+                    return voices
             
             # If SDK method doesn't exist or failed, use fallback
             logger.info("Using fallback voices list (Cartesia API may not have a voices endpoint)")
-            return self._get_fallback_voices()
+            return self._filter_voices(
+                list(zip(_FALLBACK_VOICES, _FALLBACK_VOICE_TAGS)), lang_lower, requested_tags
+            )
             
         except Exception as e:
             logger.error(f"Error fetching voices: {e}", exc_info=True)
             return self._get_fallback_voices()
     
+    def _get_voice_catalogue(self) -> Optional[List[Tuple[Dict[str, Any], frozenset]]]:
+        """
+        Return the cached SDK voice list as (voice, lowercased tags) pairs.
+        
+        The first call fetches synchronously; stale entries are served while a
+        single background refresh runs.
+        """
+        if self._voices_cache is None:
+            with self._voices_lock:
+                if self._voices_cache is None:
+                    self._refresh_voices()
+            return self._voices_cache
+        
+        if time.monotonic() - self._voices_fetched_at >= _VOICES_TTL:
+            with self._voices_lock:
+                if not self._voices_refreshing:
+                    self._voices_refreshing = True
+                    threading.Thread(target=self._refresh_voices_in_background, daemon=True).start()
+        return self._voices_cache
+    
+    def _refresh_voices_in_background(self):
+        """Background refresh target; always clears the in-flight flag."""
+        try:
+            self._refresh_voices()
+        finally:
+            self._voices_refreshing = False
+    
+    def _refresh_voices(self):
+        """
+        Fetch the voice list from the SDK and update the cache.
+        
+        On failure the stale list (or an empty one, which serves the fallback
+        voices) is kept and the next attempt waits another TTL.
+        """
+        try:
+            voices_api = getattr(self.client, 'voices', None)
+            if not hasattr(voices_api, 'list'):
+                raise AttributeError("SDK has no voices.list()")
+            voices_response = voices_api.list()
+        except Exception as sdk_error:
+            logger.warning(f"Cartesia SDK voices.list() failed: {sdk_error}, using fallback")
+            if self._voices_cache is None:
+                self._voices_cache = []
+            self._voices_fetched_at = time.monotonic()
+            return
+        
+        catalogue = []
+        # Convert SDK response to our format
+        for voice in getattr(voices_response, 'data', None) or []:
+            voice_dict = {
+                "id": getattr(voice, 'id', ''),
+                "name": getattr(voice, 'name', ''),
+                "language": getattr(voice, 'language', 'en'),
+                "tags": getattr(voice, 'tags', []),
+                "description": getattr(voice, 'description', '')
+            }
+            voice_tags = frozenset(tag.lower() for tag in voice_dict["tags"] or [])
+            catalogue.append((voice_dict, voice_tags))
+        
+        self._voices_cache = catalogue
+        self._voices_fetched_at = time.monotonic()
+        logger.info(f"Retrieved {len(catalogue)} voices from Cartesia SDK")
+    
+    @staticmethod
+    def _filter_voices(
+        catalogue: List[Tuple[Dict[str, Any], frozenset]],
+        lang_lower: Optional[str],
+        requested_tags: frozenset,
+    ) -> List[Dict[str, Any]]:
+        """Apply language/tag filters to (voice, lowercased tags) pairs."""
+        return [
+            voice
+            for voice, voice_tags in catalogue
+            if (not lang_lower or (voice["language"] or "").lower() == lang_lower)
+            and (not requested_tags or not requested_tags.isdisjoint(voice_tags))
+        ]
+    
     def get_voice(self, voice_id: str) -> Optional[Dict[str, Any]]:
         """
         Get details for a specific voice.
@@ -105,6 +269,11 @@ class CartesiaAPIService:
             Voice dictionary with details, or None if not found
         """
         try:
+            # Voices already listed via the SDK don't need another round-trip
+            for voice, _ in self._voices_cache or ():
+                if voice.get("id") == voice_id:
+                    return voice
+            
             # Try using SDK first
             if hasattr(self.client, 'voices') and hasattr(self.client.voices, 'get'):
                 try:
@@ -147,69 +316,11 @@ class CartesiaAPIService:
             List of model dictionaries
         """
         # Cartesia models are typically documented, not via API
-        # Return known models
-        return [
-            {
-                "id": "sonic-3",
-                "name": "Sonic 3",
-                "description": "Latest streaming TTS model with high naturalness and accurate transcript following",
-                "languages": ["en", "fr", "de", "es", "pt", "zh", "ja", "hi", "it", "ko", "nl", "pl", "ru", "sv", "tr", "tl", "bg", "ro", "ar", "cs", "el", "fi", "hr", "ms", "sk", "da", "ta", "uk", "hu", "no", "vi", "bn", "th", "he", "ka", "id", "te", "gu", "kn", "ml", "mr", "pa"],
-                "features": ["volume_control", "speed_control", "emotion_control", "laughter_tags"]
-            },
-            {
-                "id": "sonic-3-2025-10-27",
-                "name": "Sonic 3 (2025-10-27)",
-                "description": "Pinned snapshot of Sonic 3 from October 27, 2025",
-                "languages": ["en", "fr", "de", "es", "pt", "zh", "ja", "hi", "it", "ko", "nl", "pl", "ru", "sv", "tr", "tl", "bg", "ro", "ar", "cs", "el", "fi", "hr", "ms", "sk", "da", "ta", "uk", "hu", "no", "vi", "bn", "th", "he", "ka", "id", "te", "gu", "kn", "ml", "mr", "pa"],
-                "features": ["volume_control", "speed_control", "emotion_control", "laughter_tags"]
-            }
-        ]
+        return list(_MODELS)
     
     def _get_fallback_voices(self) -> List[Dict[str, Any]]:
         """
         Return a curated list of known Cartesia voices as fallback.
         Based on Cartesia documentation.
         """
-        return [
-            {
-                "id": "98a34ef2-2140-4c28-9c71-663dc4dd7022",
-                "name": "Tessa",
-                "language": "en",
-                "gender": "female",
-                "tags": ["Emotive", "Expressive"],
-                "description": "Expressive American English voice, great for emotive characters"
-            },
-            {
-                "id": "c961b81c-a935-4c17-bfb3-ba2239de8c2f",
-                "name": "Kyle",
-                "language": "en",
-                "gender": "male",
-                "tags": ["Emotive", "Expressive"],
-                "description": "Expressive American English voice, great for emotive characters"
-            },
-            {
-                "id": "f786b574-daa5-4673-aa0c-cbe3e8534c02",
-                "name": "Katie",
-                "language": "en",
-                "gender": "female",
-                "tags": ["Stable", "Realistic"],
-                "description": "Stable, realistic American English voice, great for voice agents"
-            },
-            {
-                "id": "228fca29-3a0a-435c-8728-5cb483251068",
-                "name": "Kiefer",
-                "language": "en",
-                "gender": "male",
-                "tags": ["Stable", "Realistic"],
-                "description": "Stable, realistic American English voice, great for voice agents"
-            },
-            {
-                "id": "6ccbfb76-1fc6-48f7-b71d-91ac6298247b",
-                "name": "Tessa (Alternative)",
-                "language": "en",
-                "gender": "female",
-                "tags": ["Emotive"],
-                "description": "Emotive American English voice"
-            }
-        ]
-
+        return list(_FALLBACK_VOICES)
@@ -2,7 +2,8 @@
 Job management service for tracking job status and metadata.
 """
 
-import json
+import bisect
+import orjson
 import logging
 import shutil
 import os
@@ -21,6 +22,11 @@ class JobService:
 
     def __init__(self):
         self.jobs: Dict[str, Dict[str, Any]] = {}
+        # (mtime_ns, size) of each job_metadata.json as of the last time it was parsed
+        self._metadata_stamps: Dict[str, tuple] = {}
+        # (created_at, job_id) pairs kept in ascending order for cheap pagination
+        self._sorted_index: List[tuple] = []
+        self._indexed_created_at: Dict[str, str] = {}
         self.lock = Lock()
         self._load_jobs()
 
@@ -38,8 +44,8 @@ class JobService:
 
             if metadata_path.exists():
                 try:
-                    with open(metadata_path, "r", encoding="utf-8") as f:
-                        metadata = json.load(f)
+                    with open(metadata_path, "rb") as f:
+                        metadata = orjson.loads(f.read())
 
                     # Use status from metadata if available, otherwise determine from files
                     status = metadata.get("status")
@@ -80,6 +86,7 @@ class JobService:
                         },
                         "progress": progress_value,
                     }
+                    self._index_job(job_id)
                     if progress_value is not None:
                         logger.info(
                             f"Loaded job {job_id} with progress: {progress_value}%"
@@ -103,8 +110,8 @@ class JobService:
         try:
             # Load existing metadata or create new
             if metadata_path.exists():
-                with open(metadata_path, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
+                with open(metadata_path, "rb") as f:
+                    metadata = orjson.loads(f.read())
             else:
                 metadata = {}
 
@@ -122,12 +129,16 @@ class JobService:
                 metadata.update(self.jobs[job_id]["metadata"])
 
             # Save back to file and flush immediately
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
+            with open(metadata_path, "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                    )
+                )
                 f.flush()  # Force write to disk immediately
                 os.fsync(f.fileno())  # Ensure OS writes to disk
 
-            logger.debug(f"Saved job status for {job_id}")
+            logger.debug("Saved job status for %s", job_id)
         except Exception as e:
             logger.warning(f"Failed to save job status for {job_id}: {e}")
 
@@ -164,6 +175,7 @@ class JobService:
                     "end_page": end_page,
                 },
             }
+            self._index_job(job_id)
             # Persist job creation to metadata file
             self._save_job_status(job_id)
 
@@ -186,6 +198,7 @@ class JobService:
                     "metadata": metadata or {},
                     "progress": progress,
                 }
+                self._index_job(job_id)
             else:
                 self.jobs[job_id]["status"] = status
                 self.jobs[job_id]["message"] = message
@@ -199,7 +212,7 @@ class JobService:
             # Log progress updates for debugging
             if progress is not None:
                 logger.info(
-                    f"Job {job_id}: Progress updated to {progress}% - {message}"
+                    "Job %s: Progress updated to %s%% - %s", job_id, progress, message
                 )
 
             # 1. Save status to local disk FIRST (so S3 picks up the latest metadata)
@@ -227,22 +240,34 @@ class JobService:
             job_dir = settings.JOBS_OUTPUT_PATH / job_id
             metadata_path = job_dir / "job_metadata.json"
 
-            if metadata_path.exists():
+            try:
+                stat = metadata_path.stat()
+            except OSError:
+                stat = None
+
+            if stat is not None:
+                # Skip the re-parse when the file hasn't changed since we last read it
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                if self._metadata_stamps.get(job_id) == stamp and job_id in self.jobs:
+                    return self.jobs[job_id]
+
                 try:
-                    with open(metadata_path, "r", encoding="utf-8") as f:
-                        metadata = json.load(f)
+                    with open(metadata_path, "rb") as f:
+                        metadata = orjson.loads(f.read())
 
                     # Update in-memory cache with latest data from disk
                     status = metadata.get("status", "pending")
                     progress_value = metadata.get("progress")
+                    # Only format a timestamp when the file doesn't carry one
+                    created_at = metadata.get("created_at")
+                    if created_at is None:
+                        created_at = datetime.now().isoformat()
 
                     self.jobs[job_id] = {
                         "job_id": job_id,
                         "status": status,
                         "message": metadata.get("message", ""),
-                        "created_at": metadata.get(
-                            "created_at", datetime.now().isoformat()
-                        ),
+                        "created_at": created_at,
                         "metadata": {
                             k: v
                             for k, v in metadata.items()
@@ -257,6 +282,8 @@ class JobService:
                         },
                         "progress": progress_value,
                     }
+                    self._metadata_stamps[job_id] = stamp
+                    self._index_job(job_id)
 
                     return self.jobs[job_id]
                 except Exception as e:
@@ -265,10 +292,33 @@ class JobService:
             # Fallback to in-memory data if file doesn't exist
             return self.jobs.get(job_id)
 
+    def _index_job(self, job_id: str):
+        """Insert or reposition a job in the created_at-sorted index."""
+        created_at = self.jobs[job_id].get("created_at", "")
+        previous = self._indexed_created_at.get(job_id)
+        if previous == created_at:
+            return
+        if previous is not None:
+            pos = bisect.bisect_left(self._sorted_index, (previous, job_id))
+            if pos < len(self._sorted_index) and self._sorted_index[pos] == (previous, job_id):
+                del self._sorted_index[pos]
+        bisect.insort(self._sorted_index, (created_at, job_id))
+        self._indexed_created_at[job_id] = created_at
+
     def list_jobs(self, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
-        """List jobs with pagination."""
+        """List jobs with pagination, newest first."""
+        with self.lock:
+            # The index is ascending, so walk it backwards from the newest entry
+            end = len(self._sorted_index) - offset
+            start = max(end - limit, 0)
+            if end <= 0 or limit <= 0:
+                return []
+            return [
+                self.jobs[job_id]
+                for _, job_id in reversed(self._sorted_index[start:end])
+            ]
+
+    def count_jobs(self) -> int:
+        """Total number of known jobs."""
         with self.lock:
-            sorted_jobs = sorted(
-                self.jobs.values(), key=lambda x: x.get("created_at", ""), reverse=True
-            )
-            return sorted_jobs[offset : offset + limit]
+            return len(self._sorted_index)
@@ -1,43 +1,56 @@
 """
 FastAPI backend for PDF-to-Video generation service.
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 from pathlib import Path
+import aiofiles
+import functools
+import hashlib
 import logging
 import uuid
 import json
 from datetime import datetime
+import orjson
 
 from app.config import settings
 from app.api.job_service import JobService
 from app.api.pipeline_service import PipelineService
-from app.api.cartesia_service import CartesiaAPIService
+from app.api.cartesia_service import CartesiaAPIService, _FALLBACK_VOICES, _MODELS
 from app.phase1_pdf_processing.service import PDFExtractorService
 from app.phase2_ai_services.pdf_summarizer import generate_pdf_summary
 from app.tasks import (
     process_pdf_job_task, 
     generate_video_from_text_task, 
-    generate_reels_video_task
+    generate_reels_video_task,
+    generate_summary_task,
+    generate_summary_video_task
 )
 from fastapi.responses import RedirectResponse  # <--- Add this
 from app.utils.s3_utils import s3_manager       # <--- Add this
 
 logger = logging.getLogger(__name__)
 
+# Skip the interactive docs (and the OpenAPI schema build behind them) in production
+_docs_enabled = settings.ENV.lower() != "production"
+
 app = FastAPI(
     title="PDF to Video API",
     description="API for converting PDF books to video with narration",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    docs_url="/docs" if _docs_enabled else None,
+    redoc_url="/redoc" if _docs_enabled else None,
+    openapi_url="/openapi.json" if _docs_enabled else None,
 )
 
 # CORS middleware for React frontend
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure this properly for production
+    allow_origins=[origin.strip() for origin in settings.CORS_ORIGINS.split(",") if origin.strip()],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -47,12 +60,50 @@ app.add_middleware(
 job_service = JobService()
 pipeline_service = PipelineService(job_service=job_service)
 
-# Initialize Cartesia API service (may fail if API key not set, that's ok)
-try:
-    cartesia_api_service = CartesiaAPIService()
-except ValueError:
-    cartesia_api_service = None
-    logger.warning("Cartesia API service not available (API key not configured)")
+# The model list only changes between deploys, so clients can revalidate with If-None-Match
+MODELS_ETAG = f'"{hashlib.md5(orjson.dumps(_MODELS)).hexdigest()}"'
+
+
+@functools.lru_cache(maxsize=1)
+def get_cartesia_service() -> Optional[CartesiaAPIService]:
+    """Build the Cartesia API service on first use (None if it can't be configured)."""
+    try:
+        return CartesiaAPIService()
+    except (ValueError, ImportError):
+        logger.warning("Cartesia API service not available (API key not configured)")
+        return None
+
+
+# Uploads are copied to disk in fixed-size chunks so large PDFs never sit fully in memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def save_upload(file: UploadFile, dest: Path) -> int:
+    """Stream an uploaded file to disk and return the number of bytes written."""
+    size = 0
+    # aiofiles runs the writes in a thread so large uploads don't block the event loop
+    async with aiofiles.open(dest, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
+            size += len(chunk)
+    return size
+
+# Some clients send generic octet-stream for PDFs; the %PDF magic check still applies
+PDF_CONTENT_TYPES = frozenset({"application/pdf", "application/x-pdf", "application/octet-stream"})
+# PDF readers accept the header anywhere in the first 1024 bytes (e.g. after a BOM or junk)
+PDF_HEADER_SCAN_BYTES = 1024
+
+
+async def validate_pdf_upload(file: UploadFile):
+    """Reject non-PDF uploads before anything is written to disk."""
+    if not file.filename or not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+    if file.content_type and file.content_type not in PDF_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+    header = await file.read(PDF_HEADER_SCAN_BYTES)
+    await file.seek(0)
+    if b"%PDF-" not in header:
+        raise HTTPException(status_code=400, detail="File must be a PDF")
 
 
 class JobRequest(BaseModel):
@@ -113,8 +164,7 @@ async def upload_pdf(
     Returns:
         JobResponse with job_id and status
     """
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="File must be a PDF")
+    await validate_pdf_upload(file)
     
     # Generate unique job ID
     job_id = f"{Path(file.filename).stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
@@ -131,10 +181,8 @@ async def upload_pdf(
     # Save uploaded PDF
     pdf_path = job_dir / file.filename
     try:
-        with open(pdf_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        logger.info(f"PDF uploaded: {pdf_path} (size: {len(content)} bytes)")
+        size = await save_upload(file, pdf_path)
+        logger.info(f"PDF uploaded: {pdf_path} (size: {size} bytes)")
     except Exception as e:
         logger.error(f"Failed to save PDF: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to save PDF: {str(e)}")
@@ -324,16 +372,12 @@ async def download_video(job_id: str):
     
 
 @app.post("/api/jobs/{job_id}/generate-summary", response_model=JobResponse)
-async def generate_summary(
-    job_id: str,
-    background_tasks: BackgroundTasks
-):
+async def generate_summary(job_id: str):
     """
     Generate a book summary after main video is complete.
     
     Args:
         job_id: Unique job identifier
-        background_tasks: FastAPI background tasks
     
     Returns:
         JobResponse with updated status
@@ -345,11 +389,8 @@ async def generate_summary(
     if job["status"] != "completed":
         raise HTTPException(status_code=400, detail="Main video must be completed before generating summary")
     
-    # Start summary generation in background
-    background_tasks.add_task(
-        pipeline_service.generate_summary,
-        job_id=job_id
-    )
+    # Queue summary generation on the Celery worker
+    generate_summary_task.delay(job_id=job_id)
     
     return JobResponse(
         job_id=job_id,
@@ -407,7 +448,6 @@ async def download_summary(job_id: str):
 @app.post("/api/jobs/{job_id}/generate-summary-video", response_model=JobResponse)
 async def generate_summary_video(
     job_id: str,
-    background_tasks: BackgroundTasks,
     voice_provider: str = Form("openai"),
     openai_voice: Optional[str] = Form(None),
     cartesia_voice_id: Optional[str] = Form(None),
@@ -421,7 +461,6 @@ async def generate_summary_video(
         voice_provider: Voice provider ("openai" or "cartesia")
         cartesia_voice_id: Cartesia voice ID (if using Cartesia)
         cartesia_model_id: Cartesia model ID (if using Cartesia)
-        background_tasks: FastAPI background tasks
     
     Returns:
         JobResponse with updated status
@@ -442,9 +481,8 @@ async def generate_summary_video(
     if voice_provider.lower() == "openai" and not openai_voice:
         raise HTTPException(status_code=400, detail="Please select an OpenAI voice")
     
-    # Start summary video generation in background
-    background_tasks.add_task(
-        pipeline_service.generate_summary_video,
+    # Queue summary video generation on the Celery worker
+    generate_summary_video_task.delay(
         job_id=job_id,
         voice_provider=voice_provider,
         openai_voice=openai_voice,
@@ -517,8 +555,7 @@ async def summarize_pdf(
     Returns:
         JobResponse with job_id and status
     """
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="File must be a PDF")
+    await validate_pdf_upload(file)
     
     # Generate unique job ID
     job_id = f"summary_{Path(file.filename).stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
@@ -528,10 +565,8 @@ async def summarize_pdf(
     # Save uploaded PDF
     pdf_path = job_dir / file.filename
     try:
-        with open(pdf_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        logger.info(f"PDF uploaded for summarization: {pdf_path} (size: {len(content)} bytes)")
+        size = await save_upload(file, pdf_path)
+        logger.info(f"PDF uploaded for summarization: {pdf_path} (size: {size} bytes)")
     except Exception as e:
         logger.error(f"Failed to save PDF: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to save PDF: {str(e)}")
@@ -566,7 +601,8 @@ async def summarize_pdf(
                 job_id=job_id
             )
             
-            pdf_text = extraction_result["text_extraction"]["full_text"]
+            with open(extraction_result["output_files"]["full_text"], 'r', encoding='utf-8') as f:
+                pdf_text = f.read()
             pdf_filename = extraction_result["pdf_filename"]
             
             logger.info(f"Extracted {len(pdf_text)} characters from PDF")
@@ -781,7 +817,7 @@ async def list_jobs(limit: int = 10, offset: int = 0):
         List of jobs
     """
     jobs = job_service.list_jobs(limit=limit, offset=offset)
-    return {"jobs": jobs, "total": len(jobs)}
+    return {"jobs": jobs, "total": job_service.count_jobs()}
 
 
 # ===== CARTESIA API ENDPOINTS =====
@@ -798,25 +834,10 @@ async def list_cartesia_voices(language: Optional[str] = None, tags: Optional[st
     Returns:
         List of available voices
     """
+    cartesia_api_service = get_cartesia_service()
     if not cartesia_api_service:
         # Return fallback voices even if service is not initialized
-        from app.api.cartesia_service import CartesiaAPIService
-        try:
-            temp_service = CartesiaAPIService()
-            voices = temp_service._get_fallback_voices()
-            return {"voices": voices, "note": "Using fallback voices (API service not initialized)"}
-        except:
-            # Last resort: return hardcoded fallback
-            voices = [
-                {
-                    "id": "98a34ef2-2140-4c28-9c71-663dc4dd7022",
-                    "name": "Tessa",
-                    "language": "en",
-                    "tags": ["Emotive", "Expressive"],
-                    "description": "Expressive American English voice, great for emotive characters"
-                }
-            ]
-            return {"voices": voices, "note": "Using minimal fallback (API key not configured)"}
+        return {"voices": list(_FALLBACK_VOICES), "note": "Using fallback voices (API service not initialized)"}
     
     tag_list = tags.split(",") if tags else None
     try:
@@ -840,6 +861,7 @@ async def get_cartesia_voice(voice_id: str):
     Returns:
         Voice details
     """
+    cartesia_api_service = get_cartesia_service()
     if not cartesia_api_service:
         raise HTTPException(
             status_code=503,
@@ -854,21 +876,25 @@ async def get_cartesia_voice(voice_id: str):
 
 
 @app.get("/api/cartesia/models")
-async def list_cartesia_models():
+async def list_cartesia_models(request: Request):
     """
     List available Cartesia TTS models.
     
     Returns:
-        List of available models
+        List of available models (304 if the client's ETag is current)
     """
+    cartesia_api_service = get_cartesia_service()
     if not cartesia_api_service:
         raise HTTPException(
             status_code=503,
             detail="Cartesia API service not available. Please configure CARTESIA_API_KEY."
         )
     
+    if request.headers.get("if-none-match") == MODELS_ETAG:
+        return Response(status_code=304, headers={"ETag": MODELS_ETAG})
+    
     models = cartesia_api_service.list_models()
-    return {"models": models}
+    return ORJSONResponse({"models": models}, headers={"ETag": MODELS_ETAG})
 
 @app.post("/api/upload-audio", response_model=JobResponse)
 async def upload_audio_file(
@@ -884,9 +910,7 @@ async def upload_audio_file(
     
     # Save Audio
     audio_path = job_dir / file.filename
-    with open(audio_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    await save_upload(file, audio_path)
     
     # Create Job
     job_service.create_job(job_id=job_id, pdf_path=None)
@@ -3,6 +3,9 @@ Pipeline service that runs the PDF-to-Video generation pipeline.
 """
 import logging
 import json
+import time
+import fitz  # PyMuPDF
+import orjson
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -12,7 +15,7 @@ from app.logging_config import setup_logging
 from app.phase1_pdf_processing.service import PDFExtractorService
 from app.phase1_pdf_processing.image_extractor import extract_images
 from app.phase1_pdf_processing.text_cleaner import clean_text
-from app.phase2_ai_services.openai_client import OpenAIService, detect_book_genre
+from app.phase2_ai_services.openai_client import OpenAIService, detect_book_genre, TIMESTAMPS_JSON_OPTION
 from app.phase2_ai_services.cartesia_client import CartesiaService
 from app.phase2_ai_services.book_summary import generate_book_summary
 from app.phase3_audio_processing.mastering import master_audio
@@ -84,10 +87,14 @@ class PipelineService:
                 progress=5
             )
             extractor_service = PDFExtractorService(output_dir=settings.JOBS_OUTPUT_PATH)
-            extraction_result = extractor_service.extract_from_pdf(
-                pdf_path=str(pdf_path),
-                job_id=job_id
-            )
+            # Text and image extraction share one parsed PyMuPDF document
+            with fitz.open(pdf_path) as pdf_doc:
+                extraction_result = extractor_service.extract_from_pdf(
+                    pdf_path=str(pdf_path),
+                    job_id=job_id,
+                    fitz_doc=pdf_doc
+                )
+                images_dir = extract_images(pdf_path, job_dir, pdf=pdf_doc)
             book_type = extraction_result.get("book_type", "unknown")
             
             raw_text_path = Path(extraction_result["output_files"]["full_text"])
@@ -98,8 +105,6 @@ class PipelineService:
                 tables_dir = job_dir / "tables"
                 tables_dir.mkdir(exist_ok=True)
             
-            images_dir = extract_images(pdf_path, job_dir)
-            
             logger.info(f"Book type detected: {book_type}")
             logger.info(f"Tables found: {extraction_result['summary']['tables_count']}")
             
@@ -295,8 +300,7 @@ class PipelineService:
             
             # Save updated timestamps - these are the final timestamps used for video generation
             timestamps_data = transcription.model_dump()
-            with open(timestamps_path, "w", encoding="utf-8") as f:
-                json.dump(timestamps_data, f, indent=2, ensure_ascii=False)
+            timestamps_path.write_bytes(orjson.dumps(timestamps_data, option=TIMESTAMPS_JSON_OPTION))
             
             logger.info(f"Timestamps regenerated from processed audio: {len(timestamps_data.get('words', []))} words, {len(timestamps_data.get('segments', []))} segments")
             logger.info(f"These timestamps will be used for frame generation to ensure perfect audio-video sync")
@@ -334,7 +338,6 @@ class PipelineService:
             )
             
             # Small delay to ensure the update is visible
-            import time
             time.sleep(0.5)
             
             self.job_service.update_job(
@@ -651,8 +654,7 @@ class PipelineService:
                 )
             
             timestamps_data = transcription.model_dump()
-            with open(timestamps_path, "w", encoding="utf-8") as f:
-                json.dump(timestamps_data, f, indent=2, ensure_ascii=False)
+            timestamps_path.write_bytes(orjson.dumps(timestamps_data, option=TIMESTAMPS_JSON_OPTION))
             
             logger.info(f"Timestamps regenerated: {len(timestamps_data.get('words', []))} words")
             
@@ -686,7 +688,6 @@ class PipelineService:
                 progress=90
             )
             
-            import time
             time.sleep(0.5)
             
             self.job_service.update_job(
@@ -880,8 +881,7 @@ class PipelineService:
                 )
             
             timestamps_data = transcription.model_dump()
-            with open(timestamps_path, "w", encoding="utf-8") as f:
-                json.dump(timestamps_data, f, indent=2, ensure_ascii=False)
+            timestamps_path.write_bytes(orjson.dumps(timestamps_data, option=TIMESTAMPS_JSON_OPTION))
             
             logger.info(f"Timestamps regenerated: {len(timestamps_data.get('words', []))} words")
             
@@ -931,7 +931,6 @@ class PipelineService:
                 progress=90
             )
             
-            import time
             time.sleep(0.5)
             
             self.job_service.update_job(
@@ -1241,8 +1240,7 @@ class PipelineService:
             
             # Save updated timestamps
             timestamps_data = transcription.model_dump()
-            with open(summary_timestamps_path, "w", encoding="utf-8") as f:
-                json.dump(timestamps_data, f, indent=2, ensure_ascii=False)
+            summary_timestamps_path.write_bytes(orjson.dumps(timestamps_data, option=TIMESTAMPS_JSON_OPTION))
             
             logger.info(f"Summary timestamps regenerated from processed audio: {len(timestamps_data.get('words', []))} words, {len(timestamps_data.get('segments', []))} segments")
             
@@ -1379,8 +1377,7 @@ class PipelineService:
             
             timestamps_data = transcription.model_dump()
             timestamps_path = job_dir / f"{job_id}_timestamps.json"
-            with open(timestamps_path, "w", encoding="utf-8") as f:
-                json.dump(timestamps_data, f, indent=2, ensure_ascii=False)
+            timestamps_path.write_bytes(orjson.dumps(timestamps_data, option=TIMESTAMPS_JSON_OPTION))
             
             logger.info(f"Transcription complete: {len(timestamps_data.get('words', []))} words")
             
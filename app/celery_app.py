@@ -21,4 +21,12 @@ celery_app.conf.update(
     enable_utc=True,
     # If the worker crashes, the task is not lost
     task_acks_late=True,
-)
\ No newline at end of file
+    # Jobs run for minutes; only reserve one at a time so idle workers can pick up the rest
+    worker_prefetch_multiplier=1,
+    # Metadata payloads can be large; keep them small in Redis
+    task_compression="gzip",
+    result_compression="gzip",
+    broker_pool_limit=20,
+    redis_max_connections=40,
+    broker_connection_retry_on_startup=True,
+)
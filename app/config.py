@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
@@ -39,11 +40,30 @@ class Settings(BaseSettings):
     _jobs_path = os.getenv('JOBS_OUTPUT_PATH')
     JOBS_OUTPUT_PATH: Path = Path(_jobs_path) if _jobs_path else (PROJECT_ROOT / "jobs")
     
+    # --- API Server ---
+    ENV: str = "development"  # Set to "production" to hide /docs, /redoc and /openapi.json
+    CORS_ORIGINS: str = "*"  # Comma-separated list of allowed origins
+
     # --- API Keys (Loaded from .env) ---
     # Try to get from environment first (loaded by dotenv), then from .env file
     OPENAI_API_KEY: str = os.getenv('OPENAI_API_KEY', "sk-...")  # Default,
     CARTESIA_API_KEY: str = os.getenv('CARTESIA_API_KEY', "")  # Optional, for Cartesia TTS
     SERPER_API_KEY: str = os.getenv('SERPER_API_KEY', "")  # Optional, for genre detection
+    CARTESIA_POOL_SIZE: int = 100  # Max pooled HTTP connections shared by all Cartesia clients
+    USE_LOCAL_WHISPER: bool = False  # Transcribe Cartesia audio with faster-whisper instead of the OpenAI API
+    LOCAL_WHISPER_MODEL: str = "large-v3-turbo"
+    CARTESIA_ENABLE_DENOISE: bool = False  # Denoise combined Cartesia audio with ffmpeg afftdn
+    USE_FORCED_ALIGNMENT: bool = False  # Align Cartesia audio to its text with torchaudio MMS_FA instead of Whisper
+    PRETTY_TIMESTAMPS_JSON: bool = False  # Indent timestamps.json for debugging; minified otherwise
+    OPENAI_TPM_LIMIT: int = 30000  # Tokens per minute allowed on the OpenAI key (summary pacing)
+    OPENAI_RPM_LIMIT: int = 500  # Requests per minute allowed on the OpenAI key
+    OPENAI_EXTRA_API_KEYS: str = ""  # Comma-separated keys from other projects/orgs; summary requests are spread across all keys
+    LLM_CACHE_ENABLED: bool = False  # Cache summarizer chat completions in JOBS_OUTPUT_PATH/.llm_cache.sqlite3 (reruns return the same text)
+    LLM_CACHE_MAX_AGE_DAYS: int = 30  # Cached responses older than this are deleted when the cache opens
+    LLM_SEMANTIC_CACHE_THRESHOLD: float = 0.0  # Cosine similarity for near-duplicate prompt hits (0 disables)
+    EXTRACTION_CACHE_ENABLED: Optional[bool] = None  # Reuse PDF extractions from JOBS_OUTPUT_PATH/.cache; unset means on unless S3 sync is configured
+    EXTRACTION_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # Least recently used extractions are evicted past this size
+    EXTRACTION_CACHE_MAX_AGE_DAYS: int = 30
 
     #AWS credientials
     AWS_ACCESS_KEY_ID: str = os.getenv('AWS_ACCESS_KEY_ID', "")
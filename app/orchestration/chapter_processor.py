@@ -13,6 +13,7 @@ from app.config import settings
 from app.phase1_pdf_processing.text_cleaner import clean_text
 from app.phase1_pdf_processing.image_extractor import extract_images
 from app.phase2_ai_services.openai_client import OpenAIService, detect_book_genre
+from app.phase2_ai_services.llm_cache import cached_chat_completion
 from app.phase3_audio_processing.mastering import master_audio
 from app.phase4_video_generation.renderer import render_video
 
@@ -329,17 +330,14 @@ Please provide a detailed summary that includes:
 Summary:"""
 
         logger.info(f"Generating summary for chapter: {chapter_title} (text length: {len(truncated_text)} chars)")
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that creates comprehensive, well-structured chapter summaries."},
-                {"role": "user", "content": prompt}
-            ],
+        summary = cached_chat_completion(
+            client,
+            "gpt-4o-mini",
+            "You are a helpful assistant that creates comprehensive, well-structured chapter summaries.",
+            prompt,
             temperature=0.7,
             max_tokens=1000
-        )
-        
-        summary = response.choices[0].message.content.strip()
+        ).strip()
         logger.info(f"Summary generated successfully ({len(summary)} characters)")
         return summary
     
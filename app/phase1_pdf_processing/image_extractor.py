@@ -1,49 +1,85 @@
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 import fitz  # PyMuPDF
 
 logger = logging.getLogger(__name__)
 
-def extract_images(pdf_path: Path, job_dir: Path, min_width: int = 400, min_height: int = 300) -> Path:
+# Image files are written in parallel once extraction is done (writes release the GIL)
+IMAGE_WRITE_WORKERS = 8
+
+def extract_images(
+    pdf_path: Path,
+    job_dir: Path,
+    min_width: int = 400,
+    min_height: int = 300,
+    pdf: Optional[fitz.Document] = None,
+) -> Path:
     """
     Extracts images from a PDF, skipping small decorative ones.
+
+    Pass an already-open `pdf` document to avoid re-parsing the file; it is
+    left open for the caller to close.
     """
     logger.info(f"Starting image extraction from {pdf_path.name}...")
     images_dir = job_dir / "images"
     images_dir.mkdir(parents=True, exist_ok=True)
-    image_count = 0
-    
+    pending_writes = []
+
+    owns_pdf = pdf is None
     try:
-        pdf = fitz.open(pdf_path)
+        if owns_pdf:
+            pdf = fitz.open(pdf_path)
+
+        # First pass: map each unique, large-enough image xref to where it first appears.
+        # Shared images (logos, headers) are listed on many pages but only need one visit.
+        first_seen = {}
         for page_index, page in enumerate(pdf):
-            images = page.get_images(full=True)
-            for count, img in enumerate(images):
+            for count, img in enumerate(page.get_images(full=False)):
                 xref = img[0]
+                if xref in first_seen:
+                    continue
                 width = img[2]
                 height = img[3]
 
                 # Filter out small images, based on Adnan's notebook
                 if width < min_width or height < min_height:
-                    continue  
-
-                extracted = pdf.extract_image(xref)
-                if not extracted or not extracted.get("image"):
                     continue
 
-                img_bytes = extracted["image"]
-                img_ext = extracted["ext"]
-                
-                filename = f"page_{page_index+1}_img_{count+1}.{img_ext}"
-                img_path = images_dir / filename
-                
-                with open(img_path, "wb") as f:
-                    f.write(img_bytes)
-                image_count += 1
-
-        pdf.close()
-        logger.info(f"Extracted {image_count} images to: {images_dir}")
+                first_seen[xref] = (page_index, count)
+
+        # Second pass: extract each unique image once, skipping byte-identical
+        # copies stored under different xrefs
+        seen_hashes = set()
+        for xref, (page_index, count) in first_seen.items():
+            extracted = pdf.extract_image(xref)
+            if not extracted or not extracted.get("image"):
+                continue
+
+            img_bytes = extracted["image"]
+            img_ext = extracted["ext"]
+
+            digest = hashlib.blake2b(img_bytes, digest_size=16).digest()
+            if digest in seen_hashes:
+                continue
+            seen_hashes.add(digest)
+
+            filename = f"page_{page_index+1}_img_{count+1}.{img_ext}"
+            pending_writes.append((images_dir / filename, img_bytes))
+
+        if owns_pdf:
+            pdf.close()
+            pdf = None
+
+        with ThreadPoolExecutor(max_workers=IMAGE_WRITE_WORKERS) as executor:
+            list(executor.map(lambda item: item[0].write_bytes(item[1]), pending_writes))
+
+        logger.info(f"Extracted {len(pending_writes)} images to: {images_dir}")
         return images_dir
     except Exception as e:
         logger.error(f"Failed to extract images: {e}", exc_info=True)
-        pdf.close()
-        raise
\ No newline at end of file
+        if owns_pdf and pdf is not None:
+            pdf.close()
+        raise
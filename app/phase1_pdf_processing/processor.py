@@ -3,12 +3,13 @@ PDF processing utilities for structured text extraction.
 Handles first page detection, index extraction, and table extraction.
 Uses adaptive strategies to handle different book types.
 """
-import re
+import os
 import logging
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
+import fitz  # PyMuPDF
 import pdfplumber
-import pandas as pd
 
 from .utils.pdf_extraction_strategies import (
     BookStructureAnalyzer,
@@ -20,33 +21,143 @@ from .utils.pdf_extraction_strategies import (
 
 logger = logging.getLogger(__name__)
 
+# Below this many pages, process-pool startup costs more than it saves
+PARALLEL_MIN_PAGES = 50
+
+# Pages per process-pool work unit: small enough to balance table-heavy stretches
+# across workers, large enough to amortize reopening the PDF in the worker
+PARALLEL_UNIT_PAGES = 8
+
+# Pages extracted ahead of the consumer when streaming page text
+PAGE_BATCH_SIZE = 500
+
+# First-page markers sit near the top of the page; only this prefix is searched
+INDICATOR_SCAN_CHARS = 1024
+
+
+def _extract_pages_worker(
+    pdf_path: str,
+    page_indices: List[int],
+    mode: str,
+    config: Optional[ExtractionConfig] = None
+) -> List[Tuple[int, Optional[object]]]:
+    """
+    Extract text and/or tables for a shard of pages in a worker process.
+    
+    Opens the PDF once per shard. Returns (page_index, result) pairs where
+    result is the page text ("text" mode), list of table dicts ("tables"
+    mode) or a (text, tables) pair ("fused" mode), with None for any part
+    that failed. Failures are logged here, where the exception is still known.
+    """
+    config = config or ExtractionConfig()
+    table_extractor = AdaptiveTableExtractor(config) if mode != "text" else None
+    x_tolerance, y_tolerance = config.text_tolerances
+    results = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for idx in page_indices:
+            text = tables = None
+            try:
+                page = pdf.pages[idx]
+                if mode != "tables":
+                    text = page.extract_text(
+                        x_tolerance=x_tolerance, y_tolerance=y_tolerance, layout=False
+                    ) or ""
+                if mode != "text":
+                    tables = table_extractor.extract(page, idx + 1)
+                page.close()
+            except Exception as e:
+                logger.warning(f"Error extracting {mode} from page {idx + 1}: {e}", exc_info=True)
+            if mode == "text":
+                results.append((idx, text))
+            elif mode == "tables":
+                results.append((idx, tables))
+            else:
+                results.append((idx, (text, tables)))
+    return results
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """
+    Return a lowercase literal that every match of `pattern` must contain.
+    
+    Takes the leading run of plain characters (after an optional \\b), e.g.
+    'chapter' for r'\\bchapter\\s+[1i]'. Returns None when no such literal
+    can be derived safely (alternation, leading metacharacters, ...).
+    """
+    if "|" in pattern:
+        return None
+    body = pattern[2:] if pattern.startswith("\\b") else pattern
+    literal = []
+    for char in body:
+        if char.isalnum() or char == " ":
+            literal.append(char)
+        else:
+            # A quantifier makes the preceding character optional/repeatable
+            if char in "?*{" and literal:
+                literal.pop()
+            break
+    return "".join(literal).lower() or None
+
 
 class PDFProcessor:
     """Process PDF files to extract structured content."""
     
-    def __init__(self, pdf_path: str, config: Optional[ExtractionConfig] = None):
+    def __init__(
+        self,
+        pdf_path: str,
+        config: Optional[ExtractionConfig] = None,
+        max_workers: Optional[int] = None,
+        fast_text: bool = True,
+        fitz_doc: Optional[fitz.Document] = None
+    ):
         """
         Initialize PDF processor.
         
         Args:
             pdf_path: Path to the PDF file
             config: Optional extraction configuration. If None, will auto-detect.
+            max_workers: Worker processes for full-document text/table passes.
+                         Defaults to the CPU count; 1 disables the process pool.
+            fast_text: Extract page text with PyMuPDF, which skips pdfplumber's
+                       layout model. pdfplumber is still used for tables and for
+                       pages where PyMuPDF finds no text.
+            fitz_doc: Already-open PyMuPDF document for pdf_path, so callers that
+                      also read images don't parse the file twice. It is left
+                      open for the caller to close.
         """
         self.pdf_path = Path(pdf_path)
         if not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
         self.pdf = None
+        self.fast_text = fast_text
+        self._fitz_doc = None
+        self._shared_fitz_doc = fitz_doc
         self.total_pages = 0
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.config = config
         self.book_type = None
         self.index_extractor = None
         self.table_extractor = None
+        # Extracted text per 0-based page index, shared by all extraction stages
+        self._text_cache: Dict[int, str] = {}
+        # Glyph text length per 0-based page index, a cheap upper-bound probe for text length
+        self._char_counts: Dict[int, int] = {}
+        # Cheap substring test for whether a lowercased page can match any indicator;
+        # pages it rejects skip the regex entirely
+        self._indicator_prescreen: Optional[Callable[[str], bool]] = None
         
     def __enter__(self):
         """Context manager entry."""
         self.pdf = pdfplumber.open(self.pdf_path)
         self.total_pages = len(self.pdf.pages)
+        if self.fast_text:
+            if self._shared_fitz_doc is not None:
+                self._fitz_doc = self._shared_fitz_doc
+            else:
+                self._fitz_doc = fitz.open(self.pdf_path)
+        self._text_cache = {}
+        self._char_counts = {}
         
         # Auto-detect book type and configure if not provided
         if self.config is None:
@@ -55,8 +166,24 @@ class PDFProcessor:
             self.index_extractor = AdaptiveIndexExtractor(self.config)
             self.table_extractor = AdaptiveTableExtractor(self.config)
         
+        self._indicator_prescreen = self._build_indicator_prescreen(self.config.content_indicators)
         return self
     
+    @staticmethod
+    def _build_indicator_prescreen(patterns: List[str]) -> Optional[Callable[[str], bool]]:
+        """
+        Build a substring prescreen over the indicators' required literals, or
+        None if some indicator has no literal to check.
+        """
+        if not patterns:
+            return None
+        
+        literals = [_required_literal(pattern) for pattern in patterns]
+        if not all(literals):
+            return None
+        literals = list(dict.fromkeys(literals))
+        return lambda text: any(literal in text for literal in literals)
+    
     def _auto_configure(self):
         """Auto-detect book type and configure extraction."""
         try:
@@ -70,12 +197,14 @@ class PDFProcessor:
                 max(0, self.total_pages - 5),  # Near end
             ]
             
-            for idx in sample_indices:
+            # Short documents collapse several indices onto the same page; sample each once
+            for idx in dict.fromkeys(sample_indices):
                 if idx < self.total_pages:
                     try:
-                        text = self.pdf.pages[idx].extract_text()
+                        text = self._get_page_text(idx)
                         if text:
-                            sample_pages.append(text[:1000])  # First 1000 chars
+                            # Only the first 1000 chars are analysed; the full text stays cached for later stages
+                            sample_pages.append(text[:1000])
                     except:
                         pass
             
@@ -107,41 +236,179 @@ class PDFProcessor:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
+        self._text_cache.clear()
+        self._char_counts.clear()
+        if self._fitz_doc is not None:
+            if self._fitz_doc is not self._shared_fitz_doc:
+                self._fitz_doc.close()
+            self._fitz_doc = None
         if self.pdf:
             self.pdf.close()
     
-    def extract_all_text(self) -> Dict[str, any]:
+    def _get_page_text(self, page_index: int) -> str:
         """
-        Extract all text from PDF in structured format.
+        Return the extracted text of a page (0-indexed), extracting it at most once.
         
-        Returns:
-            Dictionary containing structured text data
+        pdfplumber text extraction is the dominant per-page cost and several
+        stages read the same pages, so results are memoized in _text_cache.
+        """
+        text = self._text_cache.get(page_index)
+        if text is None:
+            text = ""
+            if self._fitz_doc is not None:
+                text = self._fitz_doc[page_index].get_text()
+            if not text.strip():
+                # Reading-order text only: layout=False skips the layout reflow pass
+                x_tolerance, y_tolerance = (self.config or ExtractionConfig).text_tolerances
+                text = self.pdf.pages[page_index].extract_text(
+                    x_tolerance=x_tolerance, y_tolerance=y_tolerance, layout=False
+                ) or ""
+            self._text_cache[page_index] = text
+        return text
+    
+    def _release_page_layout(self, page_index: int):
+        """
+        Drop pdfplumber's parsed layout objects (chars, lines, rects) for a page.
+        
+        pdfplumber keeps them on the page object for the life of the PDF, which
+        is what makes memory grow with document length. The page re-parses
+        lazily if it is touched again.
+        """
+        self.pdf.pages[page_index].close()
+    
+    def _may_have_text_length(self, page_index: int, min_length: int) -> bool:
+        """
+        Cheap check whether a page's extracted text could reach min_length.
+        
+        Text extraction only adds separators (at most one per glyph) to the
+        page's glyph text, so pages whose glyph text is under half of
+        min_length are rejected without assembling the text string.
+        """
+        if page_index in self._text_cache or self._fitz_doc is not None:
+            # Already extracted, or PyMuPDF text is cheaper than the probe itself
+            return True
+        count = self._char_counts.get(page_index)
+        if count is None:
+            count = sum(len(char["text"]) for char in self.pdf.pages[page_index].chars)
+            self._char_counts[page_index] = count
+        return count * 2 >= min_length
+    
+    def _extract_pages_parallel(
+        self,
+        page_indices: List[int],
+        mode: str
+    ) -> Optional[Dict[int, Optional[object]]]:
+        """
+        Run _extract_pages_worker over page_indices in a process pool.
+        
+        Pages are split into small contiguous work units (PARALLEL_UNIT_PAGES)
+        handed out with executor.map, so busy workers don't hold up idle ones
+        and results come back in page order. Returns a dict of page_index ->
+        result, or None when the pool is not worth starting (few pages or
+        max_workers == 1) or could not be used.
+        """
+        workers = min(self.max_workers, len(page_indices))
+        if workers <= 1 or len(page_indices) < PARALLEL_MIN_PAGES:
+            return None
+        
+        units = [
+            page_indices[i:i + PARALLEL_UNIT_PAGES]
+            for i in range(0, len(page_indices), PARALLEL_UNIT_PAGES)
+        ]
+        pdf_path = str(self.pdf_path)
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = {}
+                for unit_results in executor.map(
+                    _extract_pages_worker,
+                    [pdf_path] * len(units),
+                    units,
+                    [mode] * len(units),
+                    [self.config] * len(units),
+                ):
+                    results.update(unit_results)
+            return results
+        except Exception as e:
+            # e.g. daemonic Celery workers can't fork children; fall back to serial
+            logger.warning(f"Parallel {mode} extraction unavailable ({e}), continuing serially")
+            return None
+    
+    def iter_pages_text(
+        self,
+        batch_size: int = PAGE_BATCH_SIZE,
+        release: bool = False
+    ) -> Iterator[Dict[str, any]]:
+        """
+        Yield per-page text records ({page_number, text, char_count}) in page order.
+        
+        Pages are extracted in batches of `batch_size` (in parallel when
+        worthwhile). Pages without text are skipped; pages that fail to
+        extract yield an empty record.
+        
+        Args:
+            batch_size: Number of pages extracted ahead of the consumer
+            release: Drop each page's cached text and pdfplumber layout once it
+                     has been yielded. The yielded records are the caller's to
+                     keep or discard; release only frees the processor's copies.
         """
         if not self.pdf:
             raise RuntimeError("PDF not opened. Use context manager or call open() first.")
         
-        pages_text = []
-        for page_num, page in enumerate(self.pdf.pages, start=1):
-            try:
-                text = page.extract_text()
-                if text:
-                    pages_text.append({
+        for batch_start in range(0, self.total_pages, batch_size):
+            batch = range(batch_start, min(batch_start + batch_size, self.total_pages))
+            parallel_results = None
+            if self._fitz_doc is None:
+                uncached = [idx for idx in batch if idx not in self._text_cache]
+                parallel_results = self._extract_pages_parallel(uncached, "text")
+            if parallel_results:
+                self._text_cache.update(
+                    (idx, text) for idx, text in parallel_results.items() if text is not None
+                )
+            
+            for idx in batch:
+                page_num = idx + 1
+                try:
+                    text = self._get_page_text(idx)
+                    if text:
+                        yield {
+                            "page_number": page_num,
+                            "text": text.strip(),
+                            "char_count": len(text)
+                        }
+                except Exception as e:
+                    logger.warning(f"Error extracting text from page {page_num}: {e}")
+                    yield {
                         "page_number": page_num,
-                        "text": text.strip(),
-                        "char_count": len(text)
-                    })
-            except Exception as e:
-                logger.warning(f"Error extracting text from page {page_num}: {e}")
-                pages_text.append({
-                    "page_number": page_num,
-                    "text": "",
-                    "char_count": 0
-                })
+                        "text": "",
+                        "char_count": 0
+                    }
+                if release:
+                    self._text_cache.pop(idx, None)
+                    self._release_page_layout(idx)
+    
+    def extract_all_text(self) -> Dict[str, any]:
+        """
+        Extract all text from PDF in structured format.
+        
+        Returns:
+            Dictionary containing structured text data, including the
+            total_characters and total_text_pages summary counts
+        """
+        pages_text = []
+        total_characters = 0
+        total_text_pages = 0
+        for page in self.iter_pages_text():
+            pages_text.append(page)
+            total_characters += page["char_count"]
+            if page["text"]:
+                total_text_pages += 1
         
         return {
             "total_pages": self.total_pages,
             "pages": pages_text,
-            "full_text": "\n\n".join([p["text"] for p in pages_text])
+            "full_text": "\n\n".join([p["text"] for p in pages_text]),
+            "total_characters": total_characters,
+            "total_text_pages": total_text_pages
         }
     
     def identify_first_page(self) -> Optional[int]:
@@ -160,15 +427,16 @@ class PDFProcessor:
         if not self.pdf:
             raise RuntimeError("PDF not opened. Use context manager or call open() first.")
         
-        # Use config-based content indicators and thresholds
-        content_indicators = self.config.content_indicators if self.config else [
+        # Use config-based content indicators (precompiled, lowercase) and thresholds
+        config = self.config or ExtractionConfig(content_indicators=[
             r'\bintroduction\b',
             r'\bchapter\s+[1i]',
             r'\bpreface\b',
             r'\bforeword\b',
             r'\bprologue\b',
             r'\bpart\s+[1i]',
-        ]
+        ])
+        first_page_re = config.compiled_content_indicators
         
         min_text_length = self.config.min_content_length if self.config else 200
         skip_pages = self.config.skip_initial_pages if self.config else 0
@@ -176,24 +444,30 @@ class PDFProcessor:
         # Start checking after skip pages
         start_page = skip_pages + 1
         
-        for page_num, page in enumerate(self.pdf.pages[start_page-1:], start=start_page):
+        for page_num in range(start_page, self.total_pages + 1):
             try:
-                text = page.extract_text()
+                # Skip covers/blank pages without building their text
+                if not self._may_have_text_length(page_num - 1, min_text_length):
+                    continue
+                text = self._get_page_text(page_num - 1)
                 if not text:
                     continue
                 
-                text_lower = text.lower().strip()
-                text_length = len(text_lower)
+                text_stripped = text.strip()
+                text_length = len(text_stripped)
                 
                 # Check if page has substantial content
                 if text_length < min_text_length:
                     continue
                 
-                # Check for content indicators
-                for pattern in content_indicators:
-                    if re.search(pattern, text_lower, re.IGNORECASE):
-                        logger.info(f"First content page identified at page {page_num} (matched: {pattern})")
-                        return page_num
+                # Check for content indicators near the top of the page
+                text_lower = text_stripped[:INDICATOR_SCAN_CHARS].lower()
+                match = None
+                if self._indicator_prescreen is None or self._indicator_prescreen(text_lower):
+                    match = first_page_re.search(text_lower)
+                if match:
+                    logger.info(f"First content page identified at page {page_num} (matched: {match.group(0)})")
+                    return page_num
                 
                 # If we have substantial text and we're past initial pages, likely content
                 if page_num > skip_pages + 2 and text_length > min_text_length * 1.5:
@@ -205,9 +479,11 @@ class PDFProcessor:
                 continue
         
         # Fallback: return first page with substantial content
-        for page_num, page in enumerate(self.pdf.pages[start_page-1:], start=start_page):
+        for page_num in range(start_page, self.total_pages + 1):
             try:
-                text = page.extract_text()
+                if not self._may_have_text_length(page_num - 1, min_text_length):
+                    continue
+                text = self._get_page_text(page_num - 1)
                 if text and len(text.strip()) > min_text_length:
                     logger.info(f"First content page identified at page {page_num} (fallback)")
                     return page_num
@@ -244,8 +520,7 @@ class PDFProcessor:
         
         for page_num in range(1, min(max_pages + 1, self.total_pages + 1)):
             try:
-                page = self.pdf.pages[page_num - 1]
-                text = page.extract_text()
+                text = self._get_page_text(page_num - 1)
                 if text:
                     pages_data.append({
                         "page_number": page_num,
@@ -281,6 +556,18 @@ class PDFProcessor:
         
         all_tables = []
         
+        page_indices = list(range(start_page - 1, min(end_page, self.total_pages)))
+        parallel_results = self._extract_pages_parallel(page_indices, "tables")
+        if parallel_results is not None:
+            for idx in page_indices:
+                tables = parallel_results.get(idx)
+                if tables is None:
+                    # The worker already logged the error
+                    continue
+                all_tables.extend(tables)
+            logger.info(f"Extracted {len(all_tables)} tables from pages {start_page}-{end_page}")
+            return all_tables
+        
         for page_num in range(start_page, min(end_page + 1, self.total_pages + 1)):
             try:
                 page = self.pdf.pages[page_num - 1]
@@ -289,11 +576,57 @@ class PDFProcessor:
                 all_tables.extend(tables)
             except Exception as e:
                 logger.warning(f"Error extracting tables from page {page_num}: {e}")
-                continue
+            # Tables are the last stage to read page layout
+            self._release_page_layout(page_num - 1)
         
         logger.info(f"Extracted {len(all_tables)} tables from pages {start_page}-{end_page}")
         return all_tables
     
+    def _run_fused_pipeline(self) -> List[Dict[str, any]]:
+        """
+        Extract text and tables for every page in a single pass.
+        
+        Each page's layout is parsed once and shared by text and table
+        extraction, then released. Page text lands in _text_cache, so the
+        first-page and index stages that follow never touch the PDF again.
+        
+        Returns:
+            List of table dictionaries in page order
+        """
+        all_tables = []
+        page_indices = list(range(self.total_pages))
+        # PyMuPDF text is cheap enough to extract in-process; only tables need the pool then
+        mode = "tables" if self._fitz_doc is not None else "fused"
+        parallel_results = self._extract_pages_parallel(page_indices, mode)
+        if parallel_results is not None:
+            for idx in page_indices:
+                if mode == "tables":
+                    tables = parallel_results.get(idx)
+                else:
+                    text, tables = parallel_results.get(idx) or (None, None)
+                    if text is not None:
+                        self._text_cache[idx] = text
+                if tables is None:
+                    # The worker already logged the error
+                    continue
+                all_tables.extend(tables)
+        else:
+            for idx in page_indices:
+                page_num = idx + 1
+                try:
+                    self._get_page_text(idx)
+                except Exception as e:
+                    logger.warning(f"Error extracting text from page {page_num}: {e}")
+                try:
+                    all_tables.extend(self.table_extractor.extract(self.pdf.pages[idx], page_num))
+                except Exception as e:
+                    logger.warning(f"Error extracting tables from page {page_num}: {e}")
+                # The text is cached, so the parsed layout is no longer needed
+                self._release_page_layout(idx)
+        
+        logger.info(f"Extracted {len(all_tables)} tables from pages 1-{self.total_pages}")
+        return all_tables
+    
     def extract_structured_content(self) -> Dict[str, any]:
         """
         Extract all structured content from PDF in one call.
@@ -306,17 +639,19 @@ class PDFProcessor:
         
         logger.info(f"Starting structured content extraction from {self.pdf_path}")
         
-        # Extract all text
-        text_data = self.extract_all_text()
+        if not self.table_extractor:
+            self.table_extractor = AdaptiveTableExtractor(ExtractionConfig())
         
-        # Identify first page
-        first_page = self.identify_first_page()
+        # One pass over the pages extracts text and tables together
+        tables_data = self._run_fused_pipeline()
         
-        # Extract index
+        # The remaining stages read only the cached page text
+        text_data = self.extract_all_text()
+        first_page = self.identify_first_page()
         index_data = self.extract_index()
         
-        # Extract tables
-        tables_data = self.extract_tables()
+        # Every stage is done with the page text; release it
+        self._text_cache.clear()
         
         return {
             "pdf_path": str(self.pdf_path),
@@ -330,11 +665,11 @@ class PDFProcessor:
                 "total_pages": self.total_pages,
                 "book_type": self.book_type.value if self.book_type else "unknown",
                 "first_content_page": first_page,
-                "total_text_pages": len([p for p in text_data["pages"] if p["text"]]),
+                "total_text_pages": text_data["total_text_pages"],
                 "index_found": index_data is not None,
                 "index_entries_count": len(index_data["entries"]) if index_data else 0,
                 "tables_count": len(tables_data),
-                "total_characters": sum(p["char_count"] for p in text_data["pages"])
+                "total_characters": text_data["total_characters"]
             }
         }
 
@@ -1,16 +1,83 @@
 """
 PDF extraction service for processing PDF files and extracting structured content.
 """
-import json
+import csv
+import functools
+import hashlib
 import logging
+import mmap
+import os
+import shutil
+import time
+import fitz  # PyMuPDF
+import orjson
 from pathlib import Path
 from typing import Dict, Optional
 from datetime import datetime
 
+from app.config import settings
 from .processor import PDFProcessor
 
 logger = logging.getLogger(__name__)
 
+# Bump when the extraction output format changes so stale cache entries are ignored
+EXTRACTION_CACHE_VERSION = 2
+
+
+def _extraction_cache_enabled() -> bool:
+    """EXTRACTION_CACHE_ENABLED, defaulting to off when jobs are synced to S3 and deleted locally."""
+    if settings.EXTRACTION_CACHE_ENABLED is not None:
+        return settings.EXTRACTION_CACHE_ENABLED
+    # The cache keeps every page's text, which would undo the post-sync cleanup of job dirs
+    return not (settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY)
+
+
+@functools.cache
+def _sweep_extraction_cache(cache_dir: Path):
+    """
+    Evict cache entries older than EXTRACTION_CACHE_MAX_AGE_DAYS, then the least
+    recently used ones until the cache fits EXTRACTION_CACHE_MAX_BYTES (once per process).
+    """
+    if not cache_dir.is_dir():
+        return
+    try:
+        entries = []
+        for entry in os.scandir(cache_dir):
+            # Skip entries another worker is still writing
+            if not entry.is_dir() or ".tmp" in entry.name:
+                continue
+            size = 0
+            for root, _, files in os.walk(entry.path):
+                size += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+            entries.append((entry.stat().st_mtime, size, entry.path))
+        
+        oldest_allowed = time.time() - settings.EXTRACTION_CACHE_MAX_AGE_DAYS * 86400
+        total_size = sum(size for _, size, _ in entries)
+        # Hits refresh the entry's mtime, so the oldest mtimes are the least recently used
+        for mtime, size, path in sorted(entries):
+            if mtime >= oldest_allowed and total_size <= settings.EXTRACTION_CACHE_MAX_BYTES:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+    except OSError as e:
+        logger.warning(f"Could not sweep extraction cache {cache_dir}: {e}")
+
+
+def _link_or_copy(src, dst):
+    """
+    Hardlink src to dst, falling back to a kernel-side copy across filesystems.
+    
+    Cached artifacts are never modified in place, so sharing the inode is safe.
+    """
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # copyfile uses sendfile on Linux, so the bytes never enter userspace
+        shutil.copyfile(src, dst)
+    return dst
+
 
 class PDFExtractorService:
     """Service for extracting structured content from PDF files."""
@@ -24,6 +91,102 @@ class PDFExtractorService:
         """
         self.output_dir = Path(output_dir) if output_dir else Path("./output")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Extraction results keyed by PDF content hash and extraction flags
+        self.cache_dir = self.output_dir / ".cache"
+        self.cache_enabled = _extraction_cache_enabled()
+        if self.cache_enabled:
+            _sweep_extraction_cache(self.cache_dir)
+    
+    @staticmethod
+    def _hash_pdf(pdf_path: Path) -> str:
+        """SHA-256 of the PDF bytes, read through mmap so large files aren't loaded into memory."""
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest.update(mm)
+        return digest.hexdigest()
+    
+    def _cache_key(self, pdf_path: Path, extract_tables: bool, extract_index: bool, identify_first_page: bool) -> str:
+        """Cache key for a PDF and the extraction flags it was processed with."""
+        flags = f"v{EXTRACTION_CACHE_VERSION}:{extract_tables:d}{extract_index:d}{identify_first_page:d}"
+        cfg_hash = hashlib.sha256(flags.encode()).hexdigest()[:12]
+        return f"{self._hash_pdf(pdf_path)}_{cfg_hash}"
+    
+    def _load_from_cache(self, cache_key: str, pdf_path_obj: Path, job_id: str, job_output_dir: Path) -> Optional[Dict[str, any]]:
+        """
+        Restore a cached extraction into the job directory.
+        
+        Returns:
+            The extraction result with job-specific fields filled in, or None on a cache miss
+        """
+        entry_dir = self.cache_dir / cache_key
+        cached_json = entry_dir / "result.json"
+        if not cached_json.exists():
+            return None
+        
+        try:
+            result = orjson.loads(cached_json.read_bytes())
+            os.utime(entry_dir)
+            
+            # Copy sidecar artifacts under this job's file names
+            text_output_path = job_output_dir / f"{job_id}_full_text.txt"
+            _link_or_copy(entry_dir / "full_text.txt", text_output_path)
+            index_output_path = None
+            if (entry_dir / "index.txt").exists():
+                index_output_path = job_output_dir / f"{job_id}_index.txt"
+                _link_or_copy(entry_dir / "index.txt", index_output_path)
+            tables_dir = None
+            if (entry_dir / "tables").is_dir():
+                tables_dir = job_output_dir / "tables"
+                shutil.copytree(entry_dir / "tables", tables_dir, copy_function=_link_or_copy, dirs_exist_ok=True)
+            
+            result["job_id"] = job_id
+            result["pdf_path"] = str(pdf_path_obj.resolve())
+            result["pdf_filename"] = pdf_path_obj.name
+            result["extraction_timestamp"] = datetime.now().isoformat()
+            result["text_extraction"]["full_text_path"] = str(text_output_path)
+            
+            json_output_path = job_output_dir / f"{job_id}_extraction.json"
+            json_output_path.write_bytes(
+                orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+            )
+            
+            result["output_files"] = {
+                "json": str(json_output_path),
+                "full_text": str(text_output_path),
+                "index": str(index_output_path) if index_output_path else None,
+                "tables_directory": str(tables_dir) if tables_dir else None
+            }
+            return result
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable extraction cache entry {cache_key}: {e}")
+            return None
+    
+    def _store_in_cache(self, cache_key: str, result: Dict[str, any]):
+        """Copy an extraction result and its artifacts into the cache, atomically."""
+        entry_dir = self.cache_dir / cache_key
+        if (entry_dir / "result.json").exists():
+            return
+        
+        tmp_dir = self.cache_dir / f"{cache_key}.tmp{os.getpid()}"
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+            output_files = result["output_files"]
+            shutil.copyfile(output_files["full_text"], tmp_dir / "full_text.txt")
+            if output_files["index"]:
+                shutil.copyfile(output_files["index"], tmp_dir / "index.txt")
+            if output_files["tables_directory"]:
+                shutil.copytree(output_files["tables_directory"], tmp_dir / "tables")
+            shutil.copyfile(output_files["json"], tmp_dir / "result.json")
+            
+            # Publish the whole entry with a single rename; a concurrent writer may win the race
+            os.replace(tmp_dir, entry_dir)
+        except OSError as e:
+            logger.warning(f"Failed to cache extraction result {cache_key}: {e}")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
     
     def extract_from_pdf(
         self,
@@ -31,7 +194,8 @@ class PDFExtractorService:
         job_id: Optional[str] = None,
         extract_tables: bool = True,
         extract_index: bool = True,
-        identify_first_page: bool = True
+        identify_first_page: bool = True,
+        fitz_doc: Optional[fitz.Document] = None
     ) -> Dict[str, any]:
         """
         Extract structured content from a PDF file.
@@ -42,6 +206,8 @@ class PDFExtractorService:
             extract_tables: Whether to extract tables
             extract_index: Whether to extract index/table of contents
             identify_first_page: Whether to identify first content page
+            fitz_doc: Optional already-open PyMuPDF document for pdf_path, shared
+                      with the processor instead of opening the file again
         
         Returns:
             Dictionary containing extracted content and metadata
@@ -60,12 +226,18 @@ class PDFExtractorService:
         job_output_dir = self.output_dir / job_id
         job_output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Identical PDFs extracted with the same flags reuse the cached result
+        cache_key = None
+        if self.cache_enabled:
+            cache_key = self._cache_key(pdf_path_obj, extract_tables, extract_index, identify_first_page)
+            cached_result = self._load_from_cache(cache_key, pdf_path_obj, job_id, job_output_dir)
+            if cached_result is not None:
+                logger.info(f"Extraction cache hit for {pdf_path_obj.name}; results restored to {job_output_dir}")
+                return cached_result
+        
         try:
             # Process PDF
-            with PDFProcessor(pdf_path) as processor:
-                # Extract all text
-                text_data = processor.extract_all_text()
-                
+            with PDFProcessor(pdf_path, fitz_doc=fitz_doc) as processor:
                 # Identify first page
                 first_page = None
                 if identify_first_page:
@@ -76,6 +248,28 @@ class PDFExtractorService:
                 if extract_index:
                     index_data = processor.extract_index()
                 
+                # Stream all text: each page is written to the full-text file as it is
+                # extracted, so the whole document is never joined into one string
+                text_output_path = job_output_dir / f"{job_id}_full_text.txt"
+                pages = []
+                total_characters = 0
+                total_text_pages = 0
+                with open(text_output_path, 'w', encoding='utf-8') as f:
+                    for page in processor.iter_pages_text(release=True):
+                        if pages:
+                            f.write("\n\n")
+                        f.write(page["text"])
+                        pages.append(page)
+                        total_characters += page["char_count"]
+                        if page["text"]:
+                            total_text_pages += 1
+                text_data = {
+                    "total_pages": processor.total_pages,
+                    "pages": pages,
+                    "total_characters": total_characters,
+                    "total_text_pages": total_text_pages
+                }
+                
                 # Extract tables
                 tables_data = []
                 if extract_tables:
@@ -93,8 +287,8 @@ class PDFExtractorService:
                     "text_extraction": {
                         "total_pages": text_data["total_pages"],
                         "pages": text_data["pages"],
-                        "full_text": text_data["full_text"],
-                        "total_characters": sum(p["char_count"] for p in text_data["pages"])
+                        "full_text_path": str(text_output_path),
+                        "total_characters": text_data["total_characters"]
                     },
                     "index": index_data,
                     "tables": tables_data,
@@ -102,26 +296,22 @@ class PDFExtractorService:
                         "total_pages": processor.total_pages,
                         "book_type": processor.book_type.value if processor.book_type else "unknown",
                         "first_content_page": first_page,
-                        "total_text_pages": len([p for p in text_data["pages"] if p["text"]]),
+                        "total_text_pages": text_data["total_text_pages"],
                         "index_found": index_data is not None,
                         "index_entries_count": len(index_data["entries"]) if index_data else 0,
                         "tables_count": len(tables_data),
-                        "total_characters": sum(p["char_count"] for p in text_data["pages"])
+                        "total_characters": text_data["total_characters"]
                     }
                 }
                 
                 # Save results to JSON file
                 json_output_path = job_output_dir / f"{job_id}_extraction.json"
-                with open(json_output_path, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+                json_output_path.write_bytes(
+                    orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+                )
                 
                 logger.info(f"Extraction complete. Results saved to {json_output_path}")
                 
-                # Save full text to separate file
-                text_output_path = job_output_dir / f"{job_id}_full_text.txt"
-                with open(text_output_path, 'w', encoding='utf-8') as f:
-                    f.write(text_data["full_text"])
-                
                 # Save index to separate file if found
                 if index_data:
                     index_output_path = job_output_dir / f"{job_id}_index.txt"
@@ -137,24 +327,21 @@ class PDFExtractorService:
                 if tables_data:
                     tables_dir = job_output_dir / "tables"
                     tables_dir.mkdir(exist_ok=True)
+                    tables_prefix = f"{tables_dir}{os.sep}"
                     for table in tables_data:
-                        table_filename = f"page_{table['page_number']}_table_{table['table_index']}.csv"
-                        table_path = tables_dir / table_filename
+                        table_path = Path(f"{tables_prefix}page_{table['page_number']}_table_{table['table_index']}.csv")
                         if "csv" in table:
                             # Write CSV directly (already row-wise)
-                            with open(table_path, 'w', encoding='utf-8', newline='') as f:
-                                f.write(table["csv"])
+                            table_path.write_text(table["csv"], encoding='utf-8', newline='')
                         else:
                             # Fallback: write raw data row-wise
-                            with open(table_path, 'w', encoding='utf-8', newline='') as f:
-                                import csv
+                            with open(table_path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
                                 writer = csv.writer(f)
                                 # Write header row
                                 if table.get("header"):
                                     writer.writerow([str(c) for c in table["header"]])
                                 # Write data rows (each row is a horizontal row)
-                                for row in table.get("data", []):
-                                    writer.writerow([str(c) for c in row])
+                                writer.writerows([[str(c) for c in row] for row in table.get("data", [])])
                 
                 # Add output file paths to result
                 result["output_files"] = {
@@ -164,6 +351,9 @@ class PDFExtractorService:
                     "tables_directory": str(tables_dir) if tables_data else None
                 }
                 
+                if cache_key is not None:
+                    self._store_in_cache(cache_key, result)
+                
                 return result
                 
         except Exception as e:
@@ -237,7 +237,7 @@ def _remove_table_content(text: str, tables_dir: Path) -> str:
         # Also check for tab-separated or pipe-separated values (common table formats)
         if '\t' in line or '|' in line:
             # Count non-empty cells
-            cells = [c.strip() for c in re.split(r'[\t|]+', line) if c.strip()]
+            cells = [s for c in re.split(r'[\t|]+', line) if (s := c.strip())]
             if len(cells) >= 3:  # Likely a table row if 3+ columns
                 # Check if cells match table values
                 matching_cells = sum(1 for cell in cells if any(
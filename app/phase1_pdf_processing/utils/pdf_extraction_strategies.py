@@ -2,15 +2,79 @@
 Dynamic extraction strategies for different PDF book formats.
 Uses multiple strategies and auto-detection to handle various book types.
 """
+import csv
+import functools
+import io
 import re
 import logging
-from typing import Dict, List, Optional, Tuple, Callable
-from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Tuple, Callable
+from dataclasses import dataclass, field, fields
 from enum import Enum
-import pandas as pd
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Precompiled line-level patterns used by the index extractor
+_NUMBERED_RE = re.compile(r'[IVX]+[\.\)]|\d+[\.\)]')
+_NUMBERED_CI_RE = re.compile(r'[IVX]+[\.\)]|\d+[\.\)]', re.IGNORECASE)
+_LEADING_NUMBERED_RE = re.compile(r'^[IVX]+[\.\)]|\d+[\.\)]')
+_CONTENT_STARTER_RE = re.compile(r'^(this|the|we|it|in|on|at|as|to|for|of|a|an)\s+[a-z]')
+# First letters of the starter words; lines starting with anything else can't match
+_CONTENT_STARTER_FIRST_CHARS = frozenset('twioaf')
+_PROSE_TITLE_RE = re.compile(r'^(this|the|we|it|in|on|at|as|to|for|of|a|an)\s+[a-z]{10,}')
+# Prefix checks against lowercased lines
+_KNOWN_ENTRY_RE = re.compile(
+    r'(?:epilogue|notes|suggestions|about|appendix|bibliography|references|prologue|preface)'
+)
+_CONTINUATION_CONTENT_RE = re.compile(r'(?:this|the|we|it|in|on|at) ')
+
+# Header/footer phrases skipped on index pages
+_SKIP_PHRASES = ('copyright', 'penguin', 'title page', 'dedication', 'epigraph')
+
+
+def _contains_skip_phrase(line_lower: str) -> bool:
+    """Whether a lowercased line contains any of _SKIP_PHRASES."""
+    return any(phrase in line_lower for phrase in _SKIP_PHRASES)
+
+
+def _indicator_union(patterns: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile indicator patterns into one alternation with a named group each.
+    
+    Every alternative is wrapped in a lookahead so matches are zero-width and
+    can't consume text another indicator needs (e.g. a quoted passage hiding
+    "he said").
+    """
+    return re.compile("|".join(f"(?=(?P<g{i}>{pattern}))" for i, pattern in enumerate(patterns)))
+
+
+def _count_indicators(indicators_re: re.Pattern, text: str) -> int:
+    """Number of distinct indicators from an _indicator_union pattern found in text."""
+    found = set()
+    total = indicators_re.groups
+    for match in indicators_re.finditer(text):
+        found.add(match.lastgroup)
+        if len(found) == total:
+            break
+    return len(found)
+
+
+# Book-type indicators, matched against lowercased sample text
+_ACADEMIC_RE = _indicator_union((
+    r'\breferences\b', r'\bbibliography\b', r'\bcitation\b',
+    r'\babstract\b', r'\bintroduction\b', r'\bconclusion\b',
+    r'\bfigure\s+\d+', r'\btable\s+\d+', r'\bequation\b'
+))
+_NOVEL_RE = _indicator_union((
+    r'\bchapter\s+\d+', r'\bpart\s+\d+', r'\bepilogue\b',
+    r'"[^"]{20,}"', r'\bhe\s+said\b', r'\bshe\s+said\b'
+))
+_MANUAL_RE = _indicator_union((
+    r'\bstep\s+\d+', r'\bprocedure\b', r'\binstruction\b',
+    r'\bhow\s+to\b', r'\btutorial\b', r'\bguide\b'
+))
+
 
 class BookType(Enum):
     """Types of books that require different extraction strategies."""
@@ -21,20 +85,126 @@ class BookType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+def lowercase_pattern(pattern: str) -> str:
+    """
+    Lowercase the literal characters of a regex, leaving escapes (\\B, \\S, \\W, ...) intact.
+    
+    Lets patterns be matched against lowercased text without re.IGNORECASE.
+    """
+    chars = []
+    escaped = False
+    for char in pattern:
+        chars.append(char if escaped else char.lower())
+        escaped = char == "\\" and not escaped
+    return "".join(chars)
+
+
+def _index_pattern_union(patterns: Tuple[str, ...]) -> Tuple[Optional[re.Pattern], Tuple]:
+    """
+    Combine index patterns into one alternation that reports which one matched.
+    
+    Each pattern is wrapped in a capturing group; because the wrapper closes last,
+    match.lastindex identifies the branch. Alternation tries the branches in order,
+    so the branch found is the first pattern that matches on its own.
+    
+    Returns:
+        (union pattern, tuple indexed by lastindex of (branch, first group, end group)),
+        or (None, ()) when the patterns can't be combined safely
+    """
+    # Numbered backreferences would point at the wrong group once wrapped
+    if any(re.search(r'\\[1-9]', pattern) for pattern in patterns):
+        return None, ()
+    try:
+        branches: List[Optional[Tuple[int, int, int]]] = [None]
+        for branch, pattern in enumerate(patterns):
+            wrapper = len(branches)
+            group_count = re.compile(pattern, re.IGNORECASE).groups
+            branches.append((branch, wrapper, wrapper + group_count))
+            branches.extend([None] * group_count)
+        union = re.compile("|".join(f"({pattern})" for pattern in patterns), re.IGNORECASE)
+    except re.error:
+        # e.g. inline global flags or group names reused across patterns
+        return None, ()
+    return union, tuple(branches)
+
+
+# Derived pattern sets are cached by source tuple, so configs built from the same
+# patterns (the defaults, every unpickled worker copy) share one compiled set
+
+@functools.lru_cache(maxsize=64)
+def _lowercase_patterns(patterns: Tuple[str, ...]) -> Tuple[str, ...]:
+    """lowercase_pattern applied to each pattern."""
+    return tuple(lowercase_pattern(pattern) for pattern in patterns)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_alternation(patterns: Tuple[str, ...]) -> re.Pattern:
+    """Compile patterns into a single non-capturing alternation."""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_index_patterns(patterns: Tuple[str, ...]) -> Tuple[Tuple[re.Pattern, ...], Optional[re.Pattern], Tuple]:
+    """Compile index patterns individually (IGNORECASE) and as an _index_pattern_union."""
+    compiled = tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+    return (compiled,) + _index_pattern_union(patterns)
+
+
+# Default pattern sets, shared by every ExtractionConfig that doesn't override them
+_DEFAULT_INDEX_KEYWORDS = (
+    r'\btable\s+of\s+contents\b',
+    r'\bcontents\b',
+    r'\bindex\b',
+    r'\btoc\b',
+    r'\boverview\b',
+    r'\bchapters?\b',
+)
+
+_DEFAULT_INDEX_PATTERNS = (
+    r'^[\s]*([IVX]+[\.\)]?|\d+[\.\)]?|chapter\s+\d+|part\s+\d+)[\s]+(.+?)(?:[\s]*\.{2,}[\s]*(\d+))?[\s]*$',
+    r'^[\s]*([IVX]+[\.\)]?|\d+[\.\)]?)[\s]+(.+?)[\s]*$',
+    r'^[\s]*([A-Z][^\.]{3,50})(?:[\s]*\.{2,}[\s]*(\d+))?[\s]*$',
+)
+
+_DEFAULT_CONTENT_INDICATORS = (
+    r'\bintroduction\b',
+    r'\bchapter\s+[1i]',
+    r'\bpreface\b',
+    r'\bforeword\b',
+    r'\bprologue\b',
+    r'\bpart\s+[1i]',
+    r'\bchapter\s+one\b',
+    r'\bchapter\s+first\b',
+)
+
+
+@dataclass(frozen=True)
 class ExtractionConfig:
-    """Configuration for extraction strategies."""
+    """Configuration for extraction strategies (immutable, so instances can be shared)."""
     # Index extraction
-    index_keywords: List[str] = None
-    index_patterns: List[str] = None
+    index_keywords: Tuple[str, ...] = None
+    index_patterns: Tuple[str, ...] = None
     max_index_pages: int = 15
+    # Compiled in __post_init__: index_keywords as one alternation (for lowercased
+    # text) and each index pattern with IGNORECASE
+    compiled_index_keywords: Optional[re.Pattern] = field(default=None, init=False, repr=False)
+    compiled_index_patterns: Tuple[re.Pattern, ...] = field(default=None, init=False, repr=False)
+    # index_patterns as one alternation plus its lastindex -> branch table (see _index_pattern_union)
+    compiled_index_union: Optional[re.Pattern] = field(default=None, init=False, repr=False)
+    index_union_branches: Tuple = field(default=(), init=False, repr=False)
     min_index_entries: int = 3
     
     # First page detection
-    content_indicators: List[str] = None
+    content_indicators: Tuple[str, ...] = None
+    # Single alternation of content_indicators, compiled in __post_init__
+    compiled_content_indicators: Optional[re.Pattern] = field(default=None, init=False, repr=False)
     min_content_length: int = 200
     skip_initial_pages: int = 0
     
+    # pdfplumber text extraction: (x_tolerance, y_tolerance) for grouping chars
+    # into words and lines. pdfplumber's own defaults; widen for loosely set scans.
+    text_tolerances: Tuple[float, float] = (3, 3)
+    
     # Table extraction
     min_table_rows: int = 2
     min_table_cols: int = 2
@@ -42,35 +212,42 @@ class ExtractionConfig:
     max_cell_length: int = 500
     
     def __post_init__(self):
-        """Set defaults if not provided."""
-        if self.index_keywords is None:
-            self.index_keywords = [
-                r'\btable\s+of\s+contents\b',
-                r'\bcontents\b',
-                r'\bindex\b',
-                r'\btoc\b',
-                r'\boverview\b',
-                r'\bchapters?\b',
-            ]
-        
-        if self.index_patterns is None:
-            self.index_patterns = [
-                r'^[\s]*([IVX]+[\.\)]?|\d+[\.\)]?|chapter\s+\d+|part\s+\d+)[\s]+(.+?)(?:[\s]*\.{2,}[\s]*(\d+))?[\s]*$',
-                r'^[\s]*([IVX]+[\.\)]?|\d+[\.\)]?)[\s]+(.+?)[\s]*$',
-                r'^[\s]*([A-Z][^\.]{3,50})(?:[\s]*\.{2,}[\s]*(\d+))?[\s]*$',
-            ]
-        
-        if self.content_indicators is None:
-            self.content_indicators = [
-                r'\bintroduction\b',
-                r'\bchapter\s+[1i]',
-                r'\bpreface\b',
-                r'\bforeword\b',
-                r'\bprologue\b',
-                r'\bpart\s+[1i]',
-                r'\bchapter\s+one\b',
-                r'\bchapter\s+first\b',
-            ]
+        """Set defaults if not provided and compile the pattern sets."""
+        # Frozen dataclass: derived fields are set through object.__setattr__
+        set_field = object.__setattr__
+        index_keywords = self.index_keywords if self.index_keywords is not None else _DEFAULT_INDEX_KEYWORDS
+        index_patterns = self.index_patterns if self.index_patterns is not None else _DEFAULT_INDEX_PATTERNS
+        content_indicators = (
+            self.content_indicators if self.content_indicators is not None else _DEFAULT_CONTENT_INDICATORS
+        )
+        
+        # Keyword/indicator patterns are matched against lowercased page text
+        set_field(self, "index_keywords", _lowercase_patterns(tuple(index_keywords)))
+        set_field(self, "index_patterns", tuple(index_patterns))
+        set_field(self, "content_indicators", _lowercase_patterns(tuple(content_indicators)))
+        
+        # One search over the page replaces one search per pattern
+        set_field(self, "compiled_content_indicators", _compile_alternation(self.content_indicators))
+        set_field(self, "compiled_index_keywords", _compile_alternation(self.index_keywords))
+        compiled, union, branches = _compile_index_patterns(self.index_patterns)
+        set_field(self, "compiled_index_patterns", compiled)
+        set_field(self, "compiled_index_union", union)
+        set_field(self, "index_union_branches", branches)
+    
+    def __reduce__(self):
+        """
+        Pickle only the init fields.
+        
+        Configs are shipped to every process-pool work unit; the compiled patterns
+        are rebuilt by __post_init__ on the worker side instead of being serialized.
+        """
+        init_values = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+        return (_rebuild_config, (init_values,))
+
+
+def _rebuild_config(init_values: Dict) -> ExtractionConfig:
+    """Unpickle helper for ExtractionConfig.__reduce__."""
+    return ExtractionConfig(**init_values)
 
 
 class BookStructureAnalyzer:
@@ -88,32 +265,18 @@ class BookStructureAnalyzer:
         Returns:
             Detected book type
         """
-        combined_text = " ".join(text_samples).lower()
-        
-        # Academic/Textbook indicators
-        academic_indicators = [
-            r'\breferences\b', r'\bbibliography\b', r'\bcitation\b',
-            r'\babstract\b', r'\bintroduction\b', r'\bconclusion\b',
-            r'\bfigure\s+\d+', r'\btable\s+\d+', r'\bequation\b'
-        ]
-        academic_score = sum(1 for pattern in academic_indicators 
-                            if re.search(pattern, combined_text, re.IGNORECASE))
-        
-        # Novel indicators
-        novel_indicators = [
-            r'\bchapter\s+\d+', r'\bpart\s+\d+', r'\bepilogue\b',
-            r'"[^"]{20,}"', r'\bhe\s+said\b', r'\bshe\s+said\b'
-        ]
-        novel_score = sum(1 for pattern in novel_indicators 
-                         if re.search(pattern, combined_text, re.IGNORECASE))
-        
-        # Manual indicators
-        manual_indicators = [
-            r'\bstep\s+\d+', r'\bprocedure\b', r'\binstruction\b',
-            r'\bhow\s+to\b', r'\btutorial\b', r'\bguide\b'
-        ]
-        manual_score = sum(1 for pattern in manual_indicators 
-                          if re.search(pattern, combined_text, re.IGNORECASE))
+        combined_text = " ".join(text_samples)
+        return BookStructureAnalyzer._score_book_type(combined_text.lower(), total_pages)
+    
+    @staticmethod
+    # The result only depends on the joined samples and the page count
+    @functools.lru_cache(maxsize=128)
+    def _score_book_type(combined_text: str, total_pages: int) -> BookType:
+        """Score lowercased sample text against each book type's indicators."""
+        # Each score counts distinct indicators, found in one scan per book type
+        academic_score = _count_indicators(_ACADEMIC_RE, combined_text)
+        novel_score = _count_indicators(_NOVEL_RE, combined_text)
+        manual_score = _count_indicators(_MANUAL_RE, combined_text)
         
         # Determine type
         if academic_score >= 3:
@@ -127,37 +290,39 @@ class BookStructureAnalyzer:
         else:
             return BookType.UNKNOWN
     
-    @staticmethod
-    def get_config_for_type(book_type: BookType) -> ExtractionConfig:
+    # Built once; ExtractionConfig is immutable, so every caller can share these
+    _CONFIGS = {
+        BookType.ACADEMIC: ExtractionConfig(
+            max_index_pages=20,
+            min_index_entries=5,
+            min_content_length=300,
+            min_table_cell_fill=0.4,
+        ),
+        BookType.TEXTBOOK: ExtractionConfig(
+            max_index_pages=25,
+            min_index_entries=10,
+            min_content_length=250,
+            min_table_cell_fill=0.35,
+        ),
+        BookType.NOVEL: ExtractionConfig(
+            max_index_pages=5,
+            min_index_entries=1,
+            min_content_length=100,
+            skip_initial_pages=3,
+        ),
+        BookType.MANUAL: ExtractionConfig(
+            max_index_pages=15,
+            min_index_entries=3,
+            min_content_length=150,
+            min_table_cell_fill=0.3,
+        ),
+        BookType.UNKNOWN: ExtractionConfig(),  # Use defaults
+    }
+    
+    @classmethod
+    def get_config_for_type(cls, book_type: BookType) -> ExtractionConfig:
         """Get extraction configuration for a specific book type."""
-        configs = {
-            BookType.ACADEMIC: ExtractionConfig(
-                max_index_pages=20,
-                min_index_entries=5,
-                min_content_length=300,
-                min_table_cell_fill=0.4,
-            ),
-            BookType.TEXTBOOK: ExtractionConfig(
-                max_index_pages=25,
-                min_index_entries=10,
-                min_content_length=250,
-                min_table_cell_fill=0.35,
-            ),
-            BookType.NOVEL: ExtractionConfig(
-                max_index_pages=5,
-                min_index_entries=1,
-                min_content_length=100,
-                skip_initial_pages=3,
-            ),
-            BookType.MANUAL: ExtractionConfig(
-                max_index_pages=15,
-                min_index_entries=3,
-                min_content_length=150,
-                min_table_cell_fill=0.3,
-            ),
-            BookType.UNKNOWN: ExtractionConfig(),  # Use defaults
-        }
-        return configs.get(book_type, ExtractionConfig())
+        return cls._CONFIGS.get(book_type, cls._CONFIGS[BookType.UNKNOWN])
 
 
 class AdaptiveIndexExtractor:
@@ -213,17 +378,13 @@ class AdaptiveIndexExtractor:
     def _find_index_pages_by_keywords(self, pages: List[Dict]) -> List[Dict]:
         """Find index pages using keyword matching."""
         index_pages = []
-        for page in pages:
-            text_lower = page["text"].lower()
-            if any(re.search(pattern, text_lower, re.IGNORECASE) 
-                   for pattern in self.config.index_keywords):
+        for page_idx, page in enumerate(pages):
+            if self.config.compiled_index_keywords.search(self._page_text_lower(page)):
                 index_pages.append(page)
-                # Check next few pages for continuation
-                page_idx = pages.index(page)
+                # Check next few pages for continuation (later positions, so never already added)
                 for next_page in pages[page_idx + 1:page_idx + 3]:
-                    if self._looks_like_index_continuation(next_page["text"]):
-                        if next_page not in index_pages:
-                            index_pages.append(next_page)
+                    if self._looks_like_index_continuation(next_page):
+                        index_pages.append(next_page)
                     else:
                         break
                 break
@@ -232,205 +393,271 @@ class AdaptiveIndexExtractor:
     def _find_index_pages_by_patterns(self, pages: List[Dict]) -> List[Dict]:
         """Find index pages using pattern matching."""
         index_pages = []
-        for page in pages:
+        for page_idx, page in enumerate(pages):
             text = page["text"]
             # Look for pages with many numbered entries
-            numbered_lines = sum(1 for line in text.split('\n') 
-                               if re.search(r'[IVX]+[\.\)]|\d+[\.\)]', line, re.IGNORECASE))
-            if numbered_lines >= 3:
+            if self._count_numbered_lines(text, limit=3) >= 3:
                 index_pages.append(page)
                 # Check continuation
-                page_idx = pages.index(page)
                 for next_page in pages[page_idx + 1:page_idx + 2]:
-                    if self._looks_like_index_continuation(next_page["text"]):
-                        if next_page not in index_pages:
-                            index_pages.append(next_page)
+                    if self._looks_like_index_continuation(next_page):
+                        index_pages.append(next_page)
                 break
         return index_pages
     
+    @staticmethod
+    def _count_numbered_lines(text: str, limit: int) -> int:
+        """
+        Count lines containing a numbered marker, stopping once limit is reached.
+        
+        Searches the page text directly and jumps to the next line after each hit,
+        so the page is never split into lines.
+        """
+        search = _NUMBERED_CI_RE.search
+        count = 0
+        pos = 0
+        while count < limit:
+            match = search(text, pos)
+            if match is None:
+                break
+            count += 1
+            # The marker can't span lines; resume at the start of the next one
+            pos = text.find('\n', match.end())
+            if pos < 0:
+                break
+        return count
+    
     def _find_index_pages_by_statistics(self, pages: List[Dict]) -> List[Dict]:
         """Find index pages using statistical analysis."""
         index_pages = []
         for page in pages[:10]:  # Check first 10 pages
             text = page["text"]
-            lines = [l.strip() for l in text.split('\n') if l.strip()]
+            # Lengths of the non-blank stripped lines, reduced in C below
+            lengths = np.fromiter(
+                (len(s) for l in text.split('\n') if (s := l.strip())), dtype=np.int64
+            )
+            line_count = lengths.size
             
-            if len(lines) < 5:
+            if line_count < 5:
                 continue
             
             # Index pages typically have:
             # - Many short lines (entry titles)
             # - Consistent line length
             # - Few very long lines
-            avg_line_length = sum(len(l) for l in lines) / len(lines)
-            short_lines = sum(1 for l in lines if 10 < len(l) < 80)
-            long_lines = sum(1 for l in lines if len(l) > 150)
+            avg_line_length = lengths.mean()
+            short_lines = int(np.count_nonzero((lengths > 10) & (lengths < 80)))
+            long_lines = int(np.count_nonzero(lengths > 150))
             
             # Heuristic: index pages have many short lines, few long lines
-            if (short_lines > len(lines) * 0.5 and 
-                long_lines < len(lines) * 0.2 and
+            if (short_lines > line_count * 0.5 and 
+                long_lines < line_count * 0.2 and
                 avg_line_length < 60):
                 index_pages.append(page)
                 break
         
         return index_pages
     
-    def _looks_like_index_continuation(self, text: str) -> bool:
-        """Check if text looks like continuation of index."""
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
-        if len(lines) < 3:
-            return False
-        
-        # Check for numbered entries or short lines
-        numbered = sum(1 for l in lines if re.search(r'[IVX]+[\.\)]|\d+[\.\)]', l))
-        short_lines = sum(1 for l in lines if 5 < len(l) < 100)
-        
-        # Don't continue if we see actual content
-        content_indicators = ['this', 'the', 'we', 'it', 'in', 'on', 'at']
-        content_lines = sum(1 for l in lines 
-                          if any(l.lower().startswith(ind + ' ') for ind in content_indicators))
+    @staticmethod
+    def _page_text_lower(page: Dict) -> str:
+        """Lowercased page text, cached on the page dict so strategies share one copy."""
+        text_lower = page.get("text_lower")
+        if text_lower is None:
+            text_lower = page["text_lower"] = page["text"].lower()
+        return text_lower
+    
+    def _looks_like_index_continuation(self, page: Dict) -> bool:
+        """Check if a page looks like continuation of index."""
+        numbered = 0
+        short_lines = 0
+        content_lines = 0
+        line_count = 0
+        
+        # One pass over the lines; lowercasing never adds or removes newlines,
+        # so the original and lowercased lines stay aligned
+        lines = zip(page["text"].split('\n'), self._page_text_lower(page).split('\n'))
+        for line, line_lower in lines:
+            line = line.strip()
+            if not line:
+                continue
+            line_count += 1
+            
+            # Check for numbered entries or short lines
+            if _NUMBERED_RE.search(line):
+                numbered += 1
+            if 5 < len(line) < 100:
+                short_lines += 1
+            
+            # Don't continue if we see actual content
+            if _CONTINUATION_CONTENT_RE.match(line_lower.strip()):
+                content_lines += 1
+                if content_lines >= 2:
+                    return False
         
-        return (numbered >= 2 or short_lines > len(lines) * 0.6) and content_lines < 2
+        if line_count < 3:
+            return False
+        return numbered >= 2 or short_lines > line_count * 0.6
     
     def _extract_entries_adaptive(self, index_pages: List[Dict]) -> List[Dict]:
         """Extract index entries using adaptive pattern matching."""
-        combined_text = "\n".join([p["text"] for p in index_pages])
-        lines = combined_text.split('\n')
+        # Same lines as splitting the pages joined by "\n", without building the joined copy
+        lines = chain.from_iterable(p["text"].split('\n') for p in index_pages)
         
-        entries = []
+        # Entries keyed by lowercased title; the first entry seen for a title wins
+        entries_by_key: Dict[str, Dict] = {}
         current_entry = None
         start_collecting = False
-        seen_titles = set()  # Track seen titles to avoid duplicates
+        
+        # Loop invariants bound to locals: the body runs once per index line
+        keyword_search = self.config.compiled_index_keywords.search
+        iter_index_matches = self._iter_index_matches
+        min_entries = self.config.min_index_entries
+        is_content_line = self._is_content_line
+        save_entry = entries_by_key.setdefault
         
         for line in lines:
             line = line.strip()
+            # Lowercased once and reused by every check below
+            line_lower = line.lower()
             if not line:
                 if current_entry:
                     # Save current entry
                     title_key = current_entry["title"].lower().strip()
-                    if title_key not in seen_titles and len(title_key) > 2:
-                        entries.append(current_entry)
-                        seen_titles.add(title_key)
+                    if len(title_key) > 2:
+                        save_entry(title_key, current_entry)
                     current_entry = None
                 continue
             
             # Start collecting after finding index keyword
             if not start_collecting:
-                if any(re.search(pattern, line, re.IGNORECASE) 
-                      for pattern in self.config.index_keywords):
+                if keyword_search(line_lower):
                     start_collecting = True
                 continue
             
             # Stop if we hit actual content (but be lenient)
-            if self._is_content_line(line, entries):
+            if is_content_line(line, line_lower, len(entries_by_key)):
                 # Only stop if we have enough entries and this really looks like content
-                if len(entries) >= self.config.min_index_entries:
+                if len(entries_by_key) >= min_entries:
                     break
                 continue
             
             # Skip common header/footer text
-            if any(skip in line.lower() for skip in ['copyright', 'penguin', 'title page', 'dedication', 'epigraph']):
+            if _contains_skip_phrase(line_lower):
                 # But allow if it's part of an entry
                 if not current_entry:
                     continue
             
-            # Try each pattern
+            # Try each pattern (in order) until one yields a new entry
             matched = False
-            for pattern in self.config.index_patterns:
-                match = re.match(pattern, line, re.IGNORECASE)
-                if match:
-                    if current_entry:
-                        # Save previous entry
-                        title_key = current_entry["title"].lower().strip()
-                        if title_key not in seen_titles and len(title_key) > 2:
-                            entries.append(current_entry)
-                            seen_titles.add(title_key)
+            for groups in iter_index_matches(line):
+                if current_entry:
+                    # Save previous entry
+                    title_key = current_entry["title"].lower().strip()
+                    if len(title_key) > 2:
+                        save_entry(title_key, current_entry)
                     
-                    groups = match.groups()
-                    entry_num = groups[0] if len(groups) > 0 and groups[0] else None
-                    title = groups[1] if len(groups) > 1 and groups[1] else line
-                    page_ref = groups[2] if len(groups) > 2 and groups[2] else None
+                entry_num = groups[0] if len(groups) > 0 and groups[0] else None
+                title = groups[1] if len(groups) > 1 and groups[1] else line
+                page_ref = groups[2] if len(groups) > 2 and groups[2] else None
                     
-                    # Clean title (remove duplicates if present)
-                    if title:
-                        title = str(title).strip()
-                        # Remove duplicate words (e.g., "Title Page Title Page" -> "Title Page")
-                        words = title.split()
-                        if len(words) > 1 and words[:len(words)//2] == words[len(words)//2:]:
-                            title = " ".join(words[:len(words)//2])
+                # Clean title (remove duplicates if present)
+                if title:
+                    title = str(title).strip()
+                    # Remove duplicate words (e.g., "Title Page Title Page" -> "Title Page")
+                    words = title.split()
+                    if len(words) > 1 and words[:len(words)//2] == words[len(words)//2:]:
+                        title = " ".join(words[:len(words)//2])
                     
-                    # Validate entry
-                    if title and 2 < len(str(title)) < 300:
-                        title_key = title.lower().strip()
-                        # Skip if we've seen this title
-                        if title_key not in seen_titles:
-                            current_entry = {
-                                "entry_number": entry_num,
-                                "title": title,
-                                "page_reference": int(page_ref) if page_ref and page_ref.isdigit() else None
-                            }
-                            matched = True
-                            break
-                    else:
-                        current_entry = None
-                        matched = False
+                # Validate entry
+                if title and 2 < len(str(title)) < 300:
+                    title_key = title.lower().strip()
+                    # Skip if we've seen this title
+                    if title_key not in entries_by_key:
+                        current_entry = {
+                            "entry_number": entry_num,
+                            "title": title,
+                            "page_reference": int(page_ref) if page_ref and page_ref.isdigit() else None
+                        }
+                        matched = True
+                        break
+                else:
+                    current_entry = None
+                    matched = False
             
             # Handle continuation lines or unnumbered entries
             if not matched:
                 if current_entry:
                     # This might be a continuation line
-                    if len(line) < 150 and len(current_entry["title"]) + len(line) < 300:
-                        # Check if it's not a duplicate
-                        if line.lower().strip() != current_entry["title"].lower().strip():
-                            current_entry["title"] += " " + line
+                    title = current_entry["title"]
+                    if len(line) < 150 and len(title) + len(line) < 300:
+                        # Check if it's not a duplicate (titles are built from stripped lines)
+                        if line_lower != title.lower():
+                            # The 300-char cap keeps this concatenation from growing quadratically
+                            current_entry["title"] = f"{title} {line}"
                     else:
                         # Save current entry
-                        title_key = current_entry["title"].lower().strip()
-                        if title_key not in seen_titles:
-                            entries.append(current_entry)
-                            seen_titles.add(title_key)
+                        save_entry(current_entry["title"].lower().strip(), current_entry)
                         current_entry = None
                 else:
                     # Try to match as unnumbered entry (like "Epilogue", "Notes")
                     if (2 < len(line) < 80 and 
                         line[0].isupper() and
                         not line.isupper() and
-                        not re.search(r'^[IVX]+[\.\)]|\d+[\.\)]', line)):
+                        not _LEADING_NUMBERED_RE.search(line)):
                         # Check if it's a known index entry type
-                        known_entries = ['epilogue', 'notes', 'suggestions', 'about', 'appendix', 
-                                       'bibliography', 'references', 'prologue', 'preface']
-                        line_lower = line.lower()
-                        if (any(line_lower.startswith(k) for k in known_entries) or 
-                            (len(line.split()) <= 4 and not re.search(r'^(this|the|we|it|in|on|at|as|to|for|of|a|an)\s+[a-z]', line))):
-                            title_key = line.lower().strip()
-                            if title_key not in seen_titles:
-                                entries.append({
+                        if (_KNOWN_ENTRY_RE.match(line_lower) or 
+                            (len(line.split()) <= 4 and
+                             not (line[0] in _CONTENT_STARTER_FIRST_CHARS and _CONTENT_STARTER_RE.search(line)))):
+                            if line_lower not in entries_by_key:
+                                entries_by_key[line_lower] = {
                                     "entry_number": None,
                                     "title": line,
                                     "page_reference": None
-                                })
-                                seen_titles.add(title_key)
+                                }
         
         # Save last entry
         if current_entry:
             title_key = current_entry["title"].lower().strip()
-            if title_key not in seen_titles and len(title_key) > 2:
-                entries.append(current_entry)
+            if len(title_key) > 2:
+                entries_by_key.setdefault(title_key, current_entry)
         
-        # Filter and deduplicate
+        # Filter, and deduplicate again by final title: an entry can still gain
+        # continuation lines after it was keyed
         filtered_entries = []
         seen = set()
-        for entry in entries:
+        for entry in entries_by_key.values():
             title = entry.get("title", "").lower().strip()
             if title and title not in seen and 2 < len(title) < 300:
                 # Skip if it's clearly not an index entry
-                if not re.search(r'^(this|the|we|it|in|on|at|as|to|for|of|a|an)\s+[a-z]{10,}', title):
+                if not _PROSE_TITLE_RE.search(title):
                     filtered_entries.append(entry)
                     seen.add(title)
         
         return filtered_entries
     
-    def _is_content_line(self, line: str, entries: List[Dict]) -> bool:
+    def _iter_index_matches(self, line: str) -> Iterator[Tuple]:
+        """
+        Yield the groups of each index pattern that matches line, in pattern order.
+        
+        The first match comes from a single probe of the combined alternation;
+        later patterns are only tried if the caller keeps iterating.
+        """
+        patterns = self.config.compiled_index_patterns
+        union = self.config.compiled_index_union
+        start = 0
+        if union is not None:
+            match = union.match(line)
+            if match is None:
+                return
+            branch, first, end = self.config.index_union_branches[match.lastindex]
+            yield match.groups()[first:end]
+            start = branch + 1
+        for pattern in patterns[start:]:
+            match = pattern.match(line)
+            if match:
+                yield match.groups()
+    
+    def _is_content_line(self, line: str, line_lower: str, entry_count: int) -> bool:
         """Check if line looks like actual content (not index entry)."""
         # Very long lines (>250 chars) are likely content
         if len(line) > 250:
@@ -438,19 +665,18 @@ class AdaptiveIndexExtractor:
         
         # Lines starting with common content words followed by lowercase
         # This indicates actual prose content, not index entries
-        content_starters = r'^(this|the|we|it|in|on|at|as|to|for|of|a|an)\s+[a-z]'
-        if re.search(content_starters, line, re.IGNORECASE):
+        if line_lower[:1] in _CONTENT_STARTER_FIRST_CHARS and _CONTENT_STARTER_RE.search(line_lower):
             # But allow if we have few entries (might still be collecting)
-            if len(entries) < self.config.min_index_entries:
+            if entry_count < self.config.min_index_entries:
                 return False
             # Also check if line is very long (definitely content)
             if len(line) > 150:
                 return True
         
         # Check for PROLOGUE as standalone (but allow if it's an index entry)
-        if re.match(r'^PROLOGUE$', line, re.IGNORECASE):
+        if line_lower == "prologue":
             # Only stop if we have entries and next line looks like content
-            if len(entries) >= self.config.min_index_entries:
+            if entry_count >= self.config.min_index_entries:
                 return True
         
         return False
@@ -473,8 +699,9 @@ class AdaptiveTableExtractor:
                     continue
                 
                 # Apply multiple validation strategies
-                if self._validate_table(table):
-                    structured = self._structure_table(table, page_num, idx + 1)
+                rows = self._validate_table(table)
+                if rows:
+                    structured = self._structure_table(rows, page_num, idx + 1)
                     if structured:
                         valid_tables.append(structured)
             
@@ -483,67 +710,67 @@ class AdaptiveTableExtractor:
             logger.warning(f"Error extracting tables from page {page_num}: {e}")
             return []
     
-    def _validate_table(self, table: List[List]) -> bool:
-        """Validate if table structure is legitimate."""
+    def _validate_table(self, table: List[List]) -> Optional[List[List[str]]]:
+        """
+        Validate if table structure is legitimate.
+        
+        Returns:
+            The table's non-empty rows with cells stripped to strings (reused by
+            _structure_table), or None if the table is rejected
+        """
         if not table:
-            return False
+            return None
         
-        # Get non-empty rows
-        non_empty_rows = [row for row in table 
-                         if row and any(str(cell).strip() for cell in row if cell)]
+        # One pass over the rows collects everything the checks below need
+        rows = []
+        max_cols = 0
+        total_cells = 0
+        filled_cells = 0
+        long_cells = 0
+        max_cell_length = self.config.max_cell_length
+        for row in table:
+            if not row:
+                continue
+            cleaned = [str(cell).strip() if cell else "" for cell in row]
+            filled = sum(1 for cell in cleaned if cell)
+            if not filled:
+                continue
+            rows.append(cleaned)
+            max_cols = max(max_cols, len(row))
+            total_cells += len(row)
+            filled_cells += filled
+            long_cells += sum(1 for cell in cleaned if len(cell) > max_cell_length)
         
-        if len(non_empty_rows) < self.config.min_table_rows:
-            return False
+        if len(rows) < self.config.min_table_rows:
+            return None
         
         # Check column count
-        max_cols = max(len(row) for row in non_empty_rows if row)
         if max_cols < self.config.min_table_cols:
-            return False
+            return None
         
         # Check cell fill ratio
-        total_cells = sum(len(row) for row in non_empty_rows)
-        filled_cells = sum(1 for row in non_empty_rows 
-                          for cell in row if cell and str(cell).strip())
-        
         if total_cells == 0:
-            return False
+            return None
         
         fill_ratio = filled_cells / total_cells
         if fill_ratio < self.config.min_table_cell_fill:
-            return False
+            return None
         
         # Check for too many very long cells (likely formatted text, not table)
-        long_cells = sum(1 for row in non_empty_rows 
-                        for cell in row 
-                        if cell and len(str(cell).strip()) > self.config.max_cell_length)
-        
-        if long_cells > len(non_empty_rows) * 0.5:
-            return False
+        if long_cells > len(rows) * 0.5:
+            return None
         
-        return True
+        return rows
     
-    def _structure_table(self, table: List[List], page_num: int, table_idx: int) -> Optional[Dict]:
-        """Structure table data."""
+    def _structure_table(self, rows: List[List[str]], page_num: int, table_idx: int) -> Optional[Dict]:
+        """Structure table data from the stripped rows returned by _validate_table."""
         try:
-            non_empty_rows = [row for row in table 
-                            if row and any(str(cell).strip() for cell in row if cell)]
-            
-            if not non_empty_rows:
+            if not rows:
                 return None
             
             # Identify header (first substantial row)
-            header_row = None
-            data_rows = []
-            
-            for row in non_empty_rows:
-                cleaned = [str(cell).strip() if cell else "" for cell in row]
-                if not any(cleaned):
-                    continue
-                
-                if header_row is None:
-                    header_row = cleaned
-                else:
-                    data_rows.append(cleaned)
+            header_row = rows[0]
+            data_rows = rows[1:]
             
             if not data_rows:
                 return None
@@ -558,30 +785,22 @@ class AdaptiveTableExtractor:
                     row = row[:header_len]
                 normalized_data.append(row)
             
-            # Create DataFrame
-            try:
-                df = pd.DataFrame(normalized_data, columns=header_row)
-                return {
-                    "page_number": page_num,
-                    "table_index": table_idx,
-                    "header": header_row,
-                    "data": normalized_data,
-                    "row_count": len(normalized_data),
-                    "column_count": header_len,
-                    "dataframe": df.to_dict('records'),
-                    "csv": df.to_csv(index=False, lineterminator='\n')
-                }
-            except Exception as e:
-                logger.warning(f"Error creating DataFrame: {e}")
-                return {
-                    "page_number": page_num,
-                    "table_index": table_idx,
-                    "header": header_row,
-                    "data": normalized_data,
-                    "row_count": len(normalized_data),
-                    "column_count": header_len,
-                    "raw_table": table
-                }
+            # Records and CSV straight from the row lists (same output as a
+            # DataFrame's to_dict('records') / to_csv(index=False))
+            csv_buffer = io.StringIO()
+            writer = csv.writer(csv_buffer, lineterminator='\n')
+            writer.writerow(header_row)
+            writer.writerows(normalized_data)
+            return {
+                "page_number": page_num,
+                "table_index": table_idx,
+                "header": header_row,
+                "data": normalized_data,
+                "row_count": len(normalized_data),
+                "column_count": header_len,
+                "dataframe": [dict(zip(header_row, row)) for row in normalized_data],
+                "csv": csv_buffer.getvalue()
+            }
         except Exception as e:
             logger.warning(f"Error structuring table: {e}")
             return None
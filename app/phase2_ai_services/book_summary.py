@@ -4,6 +4,7 @@ from typing import Tuple, Dict
 from openai import OpenAI
 
 from app.config import settings
+from app.phase2_ai_services.llm_cache import cached_chat_completion
 
 logger = logging.getLogger(__name__)
 
@@ -105,17 +106,10 @@ Now write the EXTENSIVE summary (plain text). The summary MUST be approximately
     
     logger.info(f"Requesting summary with max_tokens={max_tokens} (target {target_words} words)")
     
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=settings.SUMMARY_TEMPERATURE,
-        max_tokens=max_tokens
-    )
-    
-    summary_text = response.choices[0].message.content.strip()
+    # Reruns of the same book are answered from the LLM cache
+    summary_text = cached_chat_completion(
+        client, model, system_msg, prompt, settings.SUMMARY_TEMPERATURE, max_tokens
+    ).strip()
     summary_text, word_count = _enforce_word_limit(summary_text, max_words)
     estimated_minutes = round(word_count / wpm, 2)
     
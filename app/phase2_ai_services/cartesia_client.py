@@ -1,14 +1,24 @@
-import json
+import functools
+import hashlib
+import importlib.util
+import itertools
 import logging
 import os
+import re
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import subprocess
-import shutil
+import numpy as np
+import orjson
 import requests
 
 from app.config import settings
+from app.phase2_ai_services.openai_client import TIMESTAMPS_JSON_OPTION
+from app.utils.cartesia_utils import build_cartesia_client
+from app.utils.ffmpeg_utils import FFMPEG_QUIET_ARGS, get_ffmpeg_path
 
 logger = logging.getLogger(__name__)
 
@@ -23,17 +33,145 @@ except ImportError:
     CARTESIA_AVAILABLE = False
     logger.warning("Cartesia Python SDK not installed. Install with: pip install cartesia")
 
+try:
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+# faster-whisper is optional and heavy to import (CTranslate2), so it is only
+# imported when local transcription is actually used
+FASTER_WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+
+# One model per process; transcriptions are serialized, the pipeline batches internally
+_LOCAL_WHISPER_LOCK = threading.Lock()
+
+
+@functools.cache
+def _get_local_whisper_pipeline(model_name: str):
+    """Load a faster-whisper model wrapped in a BatchedInferencePipeline on first use."""
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    logger.info(f"Loading local Whisper model {model_name}...")
+    # "default" picks float16 on GPU and the model's native type on CPU
+    model = WhisperModel(model_name, device="auto", compute_type="default")
+    return BatchedInferencePipeline(model=model)
+
+
+# torchaudio is optional; forced alignment maps the known transcript onto the audio
+# with the MMS_FA wav2vec2 model instead of transcribing it
+TORCHAUDIO_AVAILABLE = importlib.util.find_spec("torchaudio") is not None
+
+_FORCED_ALIGNER_LOCK = threading.Lock()
+
+# wav2vec2 attention is quadratic in input length, so emissions are computed per window
+ALIGN_WINDOW_SECONDS = 30
+# wav2vec2 emits one frame per 320 input samples (20ms at 16kHz)
+_ALIGN_FRAME_STRIDE = 320
+# MMS_FA only knows unaccented Latin letters; below this share of fully alignable
+# words (non-English or accented text) most times would be interpolated, so Whisper is used
+FORCED_ALIGNMENT_MIN_WORD_SHARE = 0.8
+
+
+@functools.cache
+def _get_forced_aligner():
+    """Load the torchaudio MMS_FA model, tokenizer and aligner on first use."""
+    import torchaudio
+    logger.info("Loading MMS_FA forced alignment model...")
+    bundle = torchaudio.pipelines.MMS_FA
+    return bundle, bundle.get_model(with_star=False), bundle.get_tokenizer(), bundle.get_aligner()
+
+
+# Whisper results are cached by audio content; least recently used entries are
+# swept once per process when the cache grows past this size
+WHISPER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+@functools.cache
+def _get_whisper_cache_dir() -> Path:
+    """Whisper result cache directory, swept down to WHISPER_CACHE_MAX_BYTES on first use."""
+    cache_dir = settings.JOBS_OUTPUT_PATH / ".whisper_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        entries = []
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        # Hits refresh the mtime, so the oldest mtimes are the least recently used
+        for _, size, path in sorted(entries):
+            if total_size <= WHISPER_CACHE_MAX_BYTES:
+                break
+            os.unlink(path)
+            total_size -= size
+    except OSError as e:
+        logger.warning(f"Could not sweep Whisper cache {cache_dir}: {e}")
+    return cache_dir
+
+
+# ffmpeg filters applied once to the concatenated chunk audio: remove low-freq static,
+# optionally denoise, then normalize loudness across the whole track. The filter string
+# is part of the derived audio content key, so changing it invalidates cached timestamps.
+AUDIO_CLEANUP_FILTER = "highpass=f=90,lowpass=f=16000"
+# Cartesia output is already clean; denoising is opt-in and costs about real time on CPU
+DENOISE_FILTER = "afftdn=nf=-25"
+LOUDNORM_FILTER = "loudnorm=I=-16:TP=-1.5:LRA=11"
+
+
+def _derived_audio_digest(source_digests: List[str], audio_filter: str) -> str:
+    """Content key for audio produced deterministically by ffmpeg from hashed inputs."""
+    return hashlib.sha256("|".join([*source_digests, audio_filter]).encode()).hexdigest()
+
+
+def _shift_timestamps(items: List[Dict], offset: float):
+    """Add offset to the start/end of each word or segment dict, in place."""
+    if not offset or not items:
+        return
+    # The additions run as two vectorized ops; only the write-back stays per item
+    starts = np.fromiter((item["start"] for item in items), dtype=np.float64, count=len(items)) + offset
+    ends = np.fromiter((item["end"] for item in items), dtype=np.float64, count=len(items)) + offset
+    for item, start, end in zip(items, starts.tolist(), ends.tolist()):
+        item["start"] = start
+        item["end"] = end
+
+
+# One sentence per match: text up to terminal punctuation that is followed by
+# whitespace or the end of the text (so "3.14" isn't split), plus trailing whitespace.
+# Matches are contiguous and cover the whole text.
+_SENTENCE_RE = re.compile(r'.+?(?:[.!?]+(?=\s|$)|$)\s*', re.DOTALL)
+
+# Write buffer for streamed TTS audio
+AUDIO_WRITE_BUFFER = 1 << 20
+
+# Chunks are synthesized and transcribed concurrently; each one is dominated by
+# network waits on Cartesia and Whisper. Threads per stage (TTS, Whisper).
+CHUNK_WORKERS = 8
+
 
 class CartesiaService:
     """Service for Cartesia API integration (TTS with timestamps)."""
 
-    def __init__(self, voice_id: str = "98a34ef2-2140-4c28-9c71-663dc4dd7022", model_id: str = "sonic-3"):
+    def __init__(
+        self,
+        voice_id: str = "98a34ef2-2140-4c28-9c71-663dc4dd7022",
+        model_id: str = "sonic-3",
+        use_local_whisper: Optional[bool] = None,
+        enable_denoise: Optional[bool] = None,
+        use_forced_alignment: Optional[bool] = None
+    ):
         """
         Initialize Cartesia service.
         
         Args:
             voice_id: Cartesia voice ID (default: Tessa - expressive voice)
             model_id: Cartesia model ID (default: sonic-3)
+            use_local_whisper: Transcribe with faster-whisper instead of the OpenAI API
+                               (default: settings.USE_LOCAL_WHISPER)
+            enable_denoise: Run the afftdn denoiser on the combined chunk audio
+                            (default: settings.CARTESIA_ENABLE_DENOISE)
+            use_forced_alignment: Align the known text to the audio with torchaudio MMS_FA
+                                  instead of transcribing it with Whisper
+                                  (default: settings.USE_FORCED_ALIGNMENT)
         """
         if not CARTESIA_AVAILABLE:
             raise ImportError(
@@ -49,9 +187,21 @@ class CartesiaService:
                 "Please set CARTESIA_API_KEY in your .env file or environment variables."
             )
         
-        self.client = Cartesia(api_key=api_key)
+        self.client = build_cartesia_client(Cartesia, api_key)
         self.voice_id = voice_id
         self.model_id = model_id
+        self._openai_client = None
+        self.use_local_whisper = settings.USE_LOCAL_WHISPER if use_local_whisper is None else use_local_whisper
+        if self.use_local_whisper and not FASTER_WHISPER_AVAILABLE:
+            logger.warning("faster-whisper not installed, using OpenAI Whisper. Install with: pip install faster-whisper")
+            self.use_local_whisper = False
+        self.use_forced_alignment = settings.USE_FORCED_ALIGNMENT if use_forced_alignment is None else use_forced_alignment
+        if self.use_forced_alignment and not TORCHAUDIO_AVAILABLE:
+            logger.warning("torchaudio not installed, using Whisper for timestamps. Install with: pip install torchaudio")
+            self.use_forced_alignment = False
+        if enable_denoise is None:
+            enable_denoise = settings.CARTESIA_ENABLE_DENOISE
+        self.denoise_filter_chain = f"{AUDIO_CLEANUP_FILTER},{DENOISE_FILTER}" if enable_denoise else AUDIO_CLEANUP_FILTER
         logger.info(f"CartesiaService initialized (Voice ID: {self.voice_id}, Model: {self.model_id})")
 
     def _estimate_tokens(self, text: str) -> int:
@@ -63,44 +213,55 @@ class CartesiaService:
         Split text into chunks that fit within token limits.
         Cartesia can handle longer texts, but we'll chunk for safety.
         """
-        if self._estimate_tokens(text) <= max_tokens:
+        total_tokens = self._estimate_tokens(text)
+        if total_tokens <= max_tokens:
             return [text]
         
+        # Aim for equally sized chunks rather than filling each one to the limit,
+        # so the last chunk isn't a short stub and parallel workers finish together
+        n_chunks = -(-total_tokens // max_tokens)
+        target_chars = len(text) / n_chunks
+        # Smallest length _estimate_tokens puts over max_tokens
+        max_chars = (max_tokens + 1) * 4
+        
         chunks = []
-        sentences = text.split('. ')
         current_chunk = []
-        current_tokens = 0
-        
-        for sentence in sentences:
-            sentence_tokens = self._estimate_tokens(sentence)
-            if current_tokens + sentence_tokens > max_tokens and current_chunk:
-                chunks.append('. '.join(current_chunk) + '.')
-                current_chunk = [sentence]
-                current_tokens = sentence_tokens
-            else:
-                current_chunk.append(sentence)
-                current_tokens += sentence_tokens
+        current_chars = 0
+        
+        # Sentences are streamed from the text; no list of all sentences is built
+        for match in _SENTENCE_RE.finditer(text):
+            sentence = match.group()
+            if current_chunk and current_chars + len(sentence) >= max_chars:
+                chunks.append("".join(current_chunk).strip())
+                current_chunk = []
+                current_chars = 0
+            current_chunk.append(sentence)
+            current_chars += len(sentence)
+            if current_chars >= target_chars:
+                chunks.append("".join(current_chunk).strip())
+                current_chunk = []
+                current_chars = 0
         
         if current_chunk:
-            chunks.append('. '.join(current_chunk))
+            tail = "".join(current_chunk).strip()
+            # Fold a leftover sentence or two into the previous chunk when it still fits
+            if chunks and len(chunks[-1]) + 1 + len(tail) < max_chars:
+                chunks[-1] = f"{chunks[-1]} {tail}"
+            else:
+                chunks.append(tail)
         
         return chunks
 
-    def _get_ffmpeg_path(self) -> str:
-        """Get the path to ffmpeg executable."""
-        try:
-            import imageio_ffmpeg
-            return imageio_ffmpeg.get_ffmpeg_exe()
-        except ImportError:
-            pass
-        
-        ffmpeg_path = shutil.which("ffmpeg")
-        if ffmpeg_path:
-            return ffmpeg_path
-        
-        raise FileNotFoundError("FFmpeg not found. Please install ffmpeg.")
+    @property
+    def openai_client(self):
+        """OpenAI client for Whisper, created on first use and reused for every chunk."""
+        if self._openai_client is None:
+            if not OPENAI_AVAILABLE:
+                raise ImportError("OpenAI library is required for Whisper transcription. Install with: pip install openai")
+            self._openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        return self._openai_client
 
-    def _generate_audio_bytes(self, text: str, output_path: Path) -> Path:
+    def _generate_audio_bytes(self, text: str, output_path: Path) -> Tuple[Path, str]:
         """
         Generate audio using Cartesia TTS bytes endpoint.
         
@@ -109,7 +270,7 @@ class CartesiaService:
             output_path: Path to save audio file
             
         Returns:
-            Path to generated audio file
+            Tuple of (path to generated audio file, SHA-256 hex digest of its bytes)
         """
         logger.info(f"Generating audio with Cartesia TTS (model: {self.model_id}, voice: {self.voice_id})...")
         
@@ -126,17 +287,87 @@ class CartesiaService:
                 "sample_rate": 44100,
                 "encoding": "pcm_f32le",
             },
+            # httpx keeps reading the socket and hands over full buffer-sized blocks,
+            # so each write and hash update covers a large slice of the audio
+            request_options={"chunk_size": AUDIO_WRITE_BUFFER},
         )
         
-        # Write audio chunks to file
-        with open(output_path, "wb") as f:
+        # Write audio chunks to file, hashing them on the way so the Whisper
+        # cache key doesn't need a second read of the file
+        digest = hashlib.sha256()
+        # The buffer also batches small trailing blocks into few writes
+        with open(output_path, "wb", buffering=AUDIO_WRITE_BUFFER) as f:
             for chunk in chunk_iter:
                 f.write(chunk)
+                digest.update(chunk)
         
         logger.info(f"Audio saved to {output_path}")
-        return output_path
+        return output_path, digest.hexdigest()
 
-    def _get_timestamps_whisper(self, audio_path: Path) -> Dict:
+    def _get_timestamps_whisper(
+        self,
+        audio_path: Path,
+        audio_digest: Optional[str] = None,
+        transcript: Optional[str] = None
+    ) -> Dict:
+        """
+        Get word-level timestamps using Whisper, reusing cached results for identical audio.
+        
+        Results are cached on disk by SHA-256 of the audio plus the Whisper model, so
+        retries and reruns of the same text skip transcription. With forced alignment
+        enabled and the transcript given, the transcript is aligned instead.
+        
+        Args:
+            audio_path: Path to the generated audio file
+            audio_digest: Content key of the audio; the file is hashed when not given
+            transcript: Text the audio was generated from
+            
+        Returns:
+            Dictionary with words and segments in OpenAI-compatible format
+        """
+        use_alignment = self.use_forced_alignment and transcript is not None
+        if use_alignment:
+            whisper_model = f"mms-fa-{hashlib.sha256(transcript.encode()).hexdigest()[:16]}"
+        elif self.use_local_whisper:
+            whisper_model = f"local-{settings.LOCAL_WHISPER_MODEL}"
+        else:
+            whisper_model = "whisper-1"
+        if audio_digest is None:
+            with open(audio_path, "rb") as f:
+                audio_digest = hashlib.file_digest(f, "sha256").hexdigest()
+        cache_path = _get_whisper_cache_dir() / f"{audio_digest}-{whisper_model}.json"
+        
+        try:
+            timestamps_data = orjson.loads(cache_path.read_bytes())
+            os.utime(cache_path)
+            logger.info(f"Whisper cache hit for {audio_path.name}")
+            return timestamps_data
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable Whisper cache entry {cache_path.name}: {e}")
+        
+        timestamps_data = None
+        if use_alignment:
+            timestamps_data = self._get_timestamps_forced_alignment(audio_path, transcript)
+        if timestamps_data is None:
+            if self.use_local_whisper:
+                timestamps_data = self._get_timestamps_local_whisper(audio_path)
+            else:
+                timestamps_data = self._get_timestamps_openai_whisper(audio_path)
+        
+        # Write to a temp file and rename, so concurrent chunks never see a partial entry
+        tmp_path = cache_path.with_suffix(f".tmp{os.getpid()}-{threading.get_ident()}")
+        try:
+            tmp_path.write_bytes(orjson.dumps(timestamps_data))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to cache Whisper result for {audio_path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+        
+        return timestamps_data
+
+    def _get_timestamps_openai_whisper(self, audio_path: Path) -> Dict:
         """
         Get word-level timestamps using OpenAI Whisper (same as OpenAI service).
         This transcribes the generated audio to get accurate timestamps.
@@ -149,17 +380,10 @@ class CartesiaService:
         """
         logger.info("Getting timestamps using OpenAI Whisper...")
         
-        try:
-            from openai import OpenAI
-        except ImportError:
-            raise ImportError("OpenAI library is required for Whisper transcription. Install with: pip install openai")
-        
         # Use OpenAI Whisper to transcribe the audio and get timestamps
         # This is the same approach used by OpenAIService
-        openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        
         with open(audio_path, "rb") as audio_file:
-            transcription = openai_client.audio.transcriptions.create(
+            transcription = self.openai_client.audio.transcriptions.create(
                 model="whisper-1",
                 file=audio_file,
                 response_format="verbose_json",
@@ -172,6 +396,168 @@ class CartesiaService:
         
         return timestamps_data
 
+    def _get_timestamps_local_whisper(self, audio_path: Path) -> Dict:
+        """
+        Get word-level timestamps with a local faster-whisper model.
+        
+        Args:
+            audio_path: Path to the generated audio file
+            
+        Returns:
+            Dictionary with words and segments in OpenAI-compatible format
+        """
+        logger.info(f"Getting timestamps using local Whisper ({settings.LOCAL_WHISPER_MODEL})...")
+        pipeline = _get_local_whisper_pipeline(settings.LOCAL_WHISPER_MODEL)
+        
+        with _LOCAL_WHISPER_LOCK:
+            segments_iter, info = pipeline.transcribe(str(audio_path), batch_size=16, word_timestamps=True)
+            # Segments are generated lazily; consume them while holding the model
+            segments = list(segments_iter)
+        
+        words = []
+        segments_data = []
+        for segment in segments:
+            segments_data.append({
+                "id": segment.id,
+                "seek": segment.seek,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": segment.tokens,
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob
+            })
+            for word in segment.words or []:
+                words.append({"word": word.word.strip(), "start": word.start, "end": word.end})
+        
+        timestamps_data = {
+            "text": "".join(segment.text for segment in segments).strip(),
+            "language": info.language,
+            "duration": info.duration,
+            "words": words,
+            "segments": segments_data
+        }
+        
+        logger.info(f"Whisper transcription complete: {len(words)} words, {len(segments_data)} segments")
+        
+        return timestamps_data
+
+    def _get_timestamps_forced_alignment(self, audio_path: Path, transcript: str) -> Optional[Dict]:
+        """
+        Get word-level timestamps by aligning the known transcript to the audio.
+        
+        The transcript's own words are kept verbatim; only their letters are used for
+        alignment. Words with no alignable letters (numbers, symbols) fill the gap
+        between their neighbours.
+        
+        Args:
+            audio_path: Path to the generated audio file
+            transcript: Text the audio was generated from
+            
+        Returns:
+            Dictionary with words and segments in OpenAI-compatible format, or None when
+            too few words are alignable (see FORCED_ALIGNMENT_MIN_WORD_SHARE)
+        """
+        import torch
+        import torchaudio
+        
+        logger.info("Getting timestamps using MMS_FA forced alignment...")
+        bundle, model, tokenizer, aligner = _get_forced_aligner()
+        sample_rate = bundle.sample_rate
+        
+        # Transcript words with the sentence each belongs to (sentences become segments)
+        words = []
+        word_sentences = []
+        sentences = []
+        for match in _SENTENCE_RE.finditer(transcript):
+            sentence = match.group().strip()
+            if not sentence:
+                continue
+            for word in sentence.split():
+                words.append(word)
+                word_sentences.append(len(sentences))
+            sentences.append(sentence)
+        
+        alphabet = set(bundle.get_dict()) - {"-", "*"}
+        normalized = ["".join(c for c in word.lower() if c in alphabet) for word in words]
+        alignable = [i for i, word in enumerate(normalized) if word]
+        
+        # Words with letters outside the alphabet would be aligned on a fragment, or not at all
+        lettered = [[c for c in word.lower() if c.isalpha()] for word in words]
+        lettered = [letters for letters in lettered if letters]
+        fully_alignable = sum(all(c in alphabet for c in letters) for letters in lettered)
+        if lettered and fully_alignable < FORCED_ALIGNMENT_MIN_WORD_SHARE * len(lettered):
+            logger.warning(
+                f"Only {fully_alignable}/{len(lettered)} words are alignable by MMS_FA "
+                f"(non-English or accented text?); falling back to Whisper timestamps"
+            )
+            return None
+        
+        waveform, source_rate = torchaudio.load(str(audio_path))
+        waveform = torchaudio.functional.resample(waveform.mean(0, keepdim=True), source_rate, sample_rate)
+        sample_count = waveform.size(1)
+        
+        # Window boundaries; a short remainder joins the previous window
+        bounds = list(range(0, sample_count, ALIGN_WINDOW_SECONDS * sample_rate))
+        if len(bounds) > 1 and sample_count - bounds[-1] < sample_rate:
+            bounds.pop()
+        bounds.append(sample_count)
+        
+        emissions = []
+        frame_times = []
+        with _FORCED_ALIGNER_LOCK, torch.inference_mode():
+            for start, end in zip(bounds, bounds[1:]):
+                emission, _ = model(waveform[:, start:end])
+                emissions.append(emission[0])
+                frame_times.append((start + np.arange(emission.size(1)) * _ALIGN_FRAME_STRIDE) / sample_rate)
+            token_spans = aligner(torch.cat(emissions), tokenizer([normalized[i] for i in alignable]))
+        frame_times = np.concatenate(frame_times)
+        frame_seconds = _ALIGN_FRAME_STRIDE / sample_rate
+        
+        starts = [None] * len(words)
+        ends = [None] * len(words)
+        for i, spans in zip(alignable, token_spans):
+            starts[i] = float(frame_times[spans[0].start])
+            ends[i] = float(frame_times[spans[-1].end - 1] + frame_seconds)
+        
+        # Unaligned words span from the previous aligned word's end to the next one's start
+        previous_end = 0.0
+        for i in range(len(words)):
+            if starts[i] is None:
+                starts[i] = previous_end
+            else:
+                previous_end = ends[i]
+        next_start = sample_count / sample_rate
+        for i in reversed(range(len(words))):
+            if ends[i] is None:
+                ends[i] = max(next_start, starts[i])
+            else:
+                next_start = starts[i]
+        
+        words_data = [
+            {"word": word, "start": start, "end": end}
+            for word, start, end in zip(words, starts, ends)
+        ]
+        segments_data = []
+        for i, word_sentence in enumerate(word_sentences):
+            if word_sentence == len(segments_data):
+                segments_data.append({"id": word_sentence, "start": starts[i], "end": ends[i], "text": sentences[word_sentence]})
+            else:
+                segments_data[-1]["end"] = ends[i]
+        
+        timestamps_data = {
+            "text": transcript,
+            "language": "en",
+            "duration": sample_count / sample_rate,
+            "words": words_data,
+            "segments": segments_data
+        }
+        
+        logger.info(f"Forced alignment complete: {len(words_data)} words, {len(segments_data)} segments")
+        
+        return timestamps_data
 
     def generate_audio_with_timestamps(
         self, 
@@ -219,19 +605,46 @@ class CartesiaService:
     ) -> Tuple[Path, Path]:
         """Process a single text chunk."""
         # Generate audio
-        self._generate_audio_bytes(text, audio_path)
+        _, audio_digest = self._generate_audio_bytes(text, audio_path)
         
         # Get timestamps using Whisper (transcribe the generated audio)
-        timestamps_data = self._get_timestamps_whisper(audio_path)
+        timestamps_data = self._get_timestamps_whisper(audio_path, audio_digest, text)
         
         # Save timestamps
-        with open(timestamps_path, "w", encoding="utf-8") as f:
-            json.dump(timestamps_data, f, indent=2, ensure_ascii=False)
+        timestamps_path.write_bytes(orjson.dumps(timestamps_data, option=TIMESTAMPS_JSON_OPTION))
         
         logger.info(f"Job {job_id}: Audio and timestamps saved")
         
         return audio_path, timestamps_path
 
+    @staticmethod
+    def _chunk_audio_path(audio_path: Path, i: int) -> Path:
+        """Temporary raw audio file for chunk i, next to the combined track."""
+        return audio_path.parent / f"{audio_path.stem}_chunk_{i}.wav"
+
+    def _synthesize_chunk(
+        self,
+        i: int,
+        chunk: str,
+        chunk_count: int,
+        audio_path: Path,
+        job_id: str
+    ) -> Tuple[Path, str]:
+        """
+        Generate the raw audio for one chunk.
+        
+        Filtering happens once on the combined track; the filters don't change
+        timing, so Whisper timestamps for the raw chunk stay valid.
+        
+        Returns:
+            Tuple of (path to the chunk audio, SHA-256 hex digest of its bytes)
+        """
+        logger.info(f"Job {job_id}: Processing chunk {i+1}/{chunk_count}...")
+        chunk_audio = self._chunk_audio_path(audio_path, i)
+        
+        # Generate audio for chunk
+        return self._generate_audio_bytes(chunk, chunk_audio)
+
     def _process_chunked_text(
         self,
         chunks: List[str],
@@ -241,95 +654,116 @@ class CartesiaService:
     ) -> Tuple[Path, Path]:
         """Process multiple text chunks and combine results."""
         chunk_audio_files = []
-        all_words = []
-        all_segments = []
+        chunk_digests = []
+        # Per-chunk lists, flattened once at the end
+        chunk_words = []
+        chunk_segments = []
+        last_segment_end = None
         total_duration = 0.0
         
-        # Process each chunk
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Job {job_id}: Processing chunk {i+1}/{len(chunks)}...")
-            chunk_audio_raw = audio_path.parent / f"{audio_path.stem}_chunk_{i}_raw.wav"
-            chunk_audio = audio_path.parent / f"{audio_path.stem}_chunk_{i}.wav"
+        workers = min(len(chunks), CHUNK_WORKERS)
+        # Forced alignment needs each chunk's own text, so it always runs per chunk
+        transcribe_combined = self.use_local_whisper and not self.use_forced_alignment
+        try:
+            if transcribe_combined:
+                # The local model transcribes the combined audio once below, batching across
+                # chunk boundaries, so only the audio is generated per chunk
+                with ThreadPoolExecutor(max_workers=workers) as tts_pool:
+                    for chunk_audio, chunk_digest in tts_pool.map(
+                        lambda item: self._synthesize_chunk(item[0], item[1], len(chunks), audio_path, job_id),
+                        enumerate(chunks)
+                    ):
+                        chunk_audio_files.append(chunk_audio)
+                        chunk_digests.append(chunk_digest)
+            else:
+                # Two pipelined stages: each chunk goes to Whisper as soon as its audio is
+                # ready, while the TTS threads move on to the next chunks
+                with ThreadPoolExecutor(max_workers=workers) as tts_pool, \
+                        ThreadPoolExecutor(max_workers=workers) as whisper_pool:
+                    audio_futures = [
+                        tts_pool.submit(self._synthesize_chunk, i, chunk, len(chunks), audio_path, job_id)
+                        for i, chunk in enumerate(chunks)
+                    ]
+                    timestamp_futures = [
+                        whisper_pool.submit(
+                            lambda future, chunk: self._get_timestamps_whisper(*future.result(), chunk),
+                            audio_future,
+                            chunk
+                        )
+                        for audio_future, chunk in zip(audio_futures, chunks)
+                    ]
+                    try:
+                        chunk_results = [
+                            (audio_future.result(), timestamp_future.result())
+                            for audio_future, timestamp_future in zip(audio_futures, timestamp_futures)
+                        ]
+                    except BaseException:
+                        # Don't start chunks that are still queued; leaving the pools
+                        # then only waits for the requests already in flight
+                        for future in (*audio_futures, *timestamp_futures):
+                            future.cancel()
+                        raise
+                
+                # Offsets depend on every earlier chunk's duration, so they are applied serially
+                for (chunk_audio, _), chunk_timestamps in chunk_results:
+                    chunk_audio_files.append(chunk_audio)
+                    
+                    # Adjust timestamps with offset
+                    if "words" in chunk_timestamps:
+                        _shift_timestamps(chunk_timestamps["words"], total_duration)
+                        chunk_words.append(chunk_timestamps["words"])
+                    
+                    if "segments" in chunk_timestamps:
+                        _shift_timestamps(chunk_timestamps["segments"], total_duration)
+                        chunk_segments.append(chunk_timestamps["segments"])
+                        if chunk_timestamps["segments"]:
+                            last_segment_end = chunk_timestamps["segments"][-1]["end"]
+                    
+                    # Update total duration
+                    if chunk_timestamps.get("duration"):
+                        total_duration += chunk_timestamps["duration"]
+                    elif last_segment_end is not None:
+                        total_duration = last_segment_end
+                
+                all_words = list(itertools.chain.from_iterable(chunk_words))
+                all_segments = list(itertools.chain.from_iterable(chunk_segments))
             
-            # Generate audio for chunk
-            self._generate_audio_bytes(chunk, chunk_audio_raw)
+            # Combine audio files using ffmpeg
+            logger.info(f"Job {job_id}: Combining {len(chunk_audio_files)} audio chunks...")
+            ffmpeg_path = get_ffmpeg_path()
             
-            # Normalize and clean each chunk before concatenation
-            # This prevents static noise from level mismatches
-            ffmpeg_path = self._get_ffmpeg_path()
-            normalize_cmd = [
-                ffmpeg_path,
-                "-y",
-                "-i", str(chunk_audio_raw),
-                "-af", "highpass=f=90,lowpass=f=16000,afftdn=nf=-25,anlmdn=s=0.0001",  # Remove low-freq static, denoise
+            # Concatenate, clean and normalize in one filter graph: a single decode/encode
+            # pass, with loudness normalized across the whole track
+            audio_filter = f"{self.denoise_filter_chain},{LOUDNORM_FILTER}"
+            # Only errors reach stderr, so the captured output stays small
+            cmd = [ffmpeg_path, "-y", *FFMPEG_QUIET_ARGS]
+            for chunk_file in chunk_audio_files:
+                cmd += ["-i", str(chunk_file)]
+            concat_inputs = "".join(f"[{i}:a]" for i in range(len(chunk_audio_files)))
+            cmd += [
+                "-filter_complex",
+                f"{concat_inputs}concat=n={len(chunk_audio_files)}:v=0:a=1[joined];[joined]{audio_filter}[out]",
+                "-map", "[out]",
+                "-c:a", "pcm_f32le",
                 "-ar", "44100",
                 "-ac", "1",
-                "-c:a", "pcm_f32le",
-                str(chunk_audio)
+                str(audio_path)
             ]
-            subprocess.run(normalize_cmd, check=True, capture_output=True, text=True)
-            
-            # Clean up raw chunk
-            if chunk_audio_raw.exists():
-                chunk_audio_raw.unlink()
-            
-            chunk_audio_files.append(chunk_audio)
-            
-            # Get timestamps for chunk using Whisper
-            chunk_timestamps = self._get_timestamps_whisper(chunk_audio)
             
-            # Adjust timestamps with offset
-            if "words" in chunk_timestamps:
-                for word in chunk_timestamps["words"]:
-                    word["start"] += total_duration
-                    word["end"] += total_duration
-                all_words.extend(chunk_timestamps["words"])
-            
-            if "segments" in chunk_timestamps:
-                for segment in chunk_timestamps["segments"]:
-                    segment["start"] += total_duration
-                    segment["end"] += total_duration
-                all_segments.extend(chunk_timestamps["segments"])
-            
-            # Update total duration
-            if chunk_timestamps.get("duration"):
-                total_duration += chunk_timestamps["duration"]
-            elif all_segments:
-                total_duration = all_segments[-1]["end"]
-        
-        # Combine audio files using ffmpeg
-        logger.info(f"Job {job_id}: Combining {len(chunk_audio_files)} audio chunks...")
-        ffmpeg_path = self._get_ffmpeg_path()
-        
-        # Create concat file for ffmpeg
-        concat_file = audio_path.parent / "concat_list.txt"
-        with open(concat_file, "w") as f:
-            for chunk_file in chunk_audio_files:
-                f.write(f"file '{chunk_file.absolute()}'\n")
-        
-        # Concatenate audio files with normalization and smooth transitions
-        # Normalize all chunks to same level and re-encode for smooth boundaries
-        cmd = [
-            ffmpeg_path,
-            "-y",
-            "-f", "concat",
-            "-safe", "0",
-            "-i", str(concat_file),
-            "-af", "loudnorm=I=-16:TP=-1.5:LRA=11,highpass=f=90,lowpass=f=16000",  # Normalize and remove static
-            "-c:a", "pcm_f32le",
-            "-ar", "44100",
-            "-ac", "1",
-            str(audio_path)
-        ]
-        
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
-        
-        # Clean up chunk files and concat file
-        for chunk_file in chunk_audio_files:
-            if chunk_file.exists():
-                chunk_file.unlink()
-        if concat_file.exists():
-            concat_file.unlink()
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        finally:
+            # Chunk files are only inputs to the combined track; remove them even on failure
+            for i in range(len(chunks)):
+                self._chunk_audio_path(audio_path, i).unlink(missing_ok=True)
+        
+        if transcribe_combined:
+            # Timestamps from the combined track need no per-chunk offsets
+            combined_timestamps = self._get_timestamps_whisper(
+                audio_path, _derived_audio_digest(chunk_digests, audio_filter)
+            )
+            all_words = combined_timestamps["words"]
+            all_segments = combined_timestamps["segments"]
+            total_duration = combined_timestamps["duration"]
         
         # Save combined timestamps
         combined_data = {
@@ -340,8 +774,7 @@ class CartesiaService:
             "segments": all_segments
         }
         
-        with open(timestamps_path, "w", encoding="utf-8") as f:
-            json.dump(combined_data, f, indent=2, ensure_ascii=False)
+        timestamps_path.write_bytes(orjson.dumps(combined_data, option=TIMESTAMPS_JSON_OPTION))
         
         logger.info(f"Job {job_id}: Combined audio and timestamps saved")
         
@@ -0,0 +1,188 @@
+"""
+Persistent cache for chat completion responses.
+
+Responses are stored in SQLite under a SHA-256 key of the full request, so reruns
+of the same book skip the API entirely. Optionally, prompts that miss the exact
+lookup are matched to earlier near-duplicate prompts by embedding similarity.
+"""
+import functools
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import orjson
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when prompt templates change so responses to the old prompts are ignored
+TEMPLATE_VERSION = 1
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+# text-embedding-3-small accepts 8191 tokens; long prompts are embedded by their head and tail,
+# where the instructions that tell otherwise identical prompts apart usually sit
+MAX_EMBEDDING_CHARS = 24_000
+
+
+class LLMCache:
+    """SQLite-backed chat completion cache with exact and optional semantic lookup."""
+
+    def __init__(self, db_path, semantic_threshold: float = 0.0, max_age_seconds: float = 0.0):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite file
+            semantic_threshold: Minimum cosine similarity for a semantic hit; 0 disables
+                                semantic lookup (and the embedding call it needs)
+            max_age_seconds: Responses older than this are deleted on open; 0 keeps them all
+        """
+        self.semantic_threshold = semantic_threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        # WAL lets concurrent workers read while another one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, scope TEXT NOT NULL, embedding BLOB, "
+            "content TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_scope ON responses (scope)")
+        if max_age_seconds:
+            expired = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - max_age_seconds,)
+            ).rowcount
+            if expired:
+                logger.info(f"Evicted {expired} expired LLM cache entries")
+        self._conn.commit()
+
+    def get_or_set(
+        self,
+        client,
+        model: str,
+        system_message: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        create: Callable[[], str],
+        validate: Optional[Callable[[str], bool]] = None,
+        semantic: bool = True
+    ) -> str:
+        """
+        Return the cached response for this request, or call create() and cache its result.
+
+        Args:
+            client: OpenAI client, used for embeddings when semantic lookup is enabled
+            model, system_message, prompt, temperature, max_tokens: The request being cached
+            create: Performs the API call and returns the response content
+            validate: Optional check of response content; content failing it is
+                      neither served from the cache nor stored
+            semantic: Whether near-duplicate prompts may answer this one (and it them).
+                      Disable for prompts whose meaning hinges on a small part of the text.
+
+        Returns:
+            Response content
+        """
+        # Semantic hits are only considered between requests that differ in the prompt alone
+        scope = hashlib.sha256(
+            orjson.dumps([TEMPLATE_VERSION, model, system_message, temperature, max_tokens])
+        ).hexdigest()
+        key = hashlib.sha256(f"{scope}:{prompt}".encode()).hexdigest()
+
+        with self._lock:
+            row = self._conn.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+        if row and (validate is None or validate(row[0])):
+            logger.info("LLM cache hit (exact)")
+            return row[0]
+
+        embedding = None
+        if self.semantic_threshold and semantic:
+            embedding = self._embed(client, prompt)
+            content = self._nearest(scope, embedding)
+            if content is not None and (validate is None or validate(content)):
+                return content
+
+        content = create()
+        # Refusals and filtered responses have no content; they are returned but never stored
+        if not isinstance(content, str) or not content:
+            return content
+        if validate is not None and not validate(content):
+            return content
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, scope, embedding.tobytes() if embedding is not None else None, content, time.time())
+            )
+            self._conn.commit()
+        return content
+
+    def _embed(self, client, prompt: str) -> np.ndarray:
+        """Unit-normalized float32 embedding of the prompt (its head and tail when too long)."""
+        if len(prompt) > MAX_EMBEDDING_CHARS:
+            half = MAX_EMBEDDING_CHARS // 2
+            prompt = prompt[:half] + prompt[-half:]
+        response = client.embeddings.create(model=EMBEDDING_MODEL, input=prompt)
+        embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return embedding / np.linalg.norm(embedding)
+
+    def _nearest(self, scope: str, embedding: np.ndarray) -> Optional[str]:
+        """Content of the most similar cached prompt in scope, if it clears the threshold."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding, content FROM responses WHERE scope = ? AND embedding IS NOT NULL", (scope,)
+            ).fetchall()
+        if not rows:
+            return None
+
+        matrix = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        similarities = matrix @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.semantic_threshold:
+            return None
+        logger.info(f"LLM cache hit (semantic, similarity {similarities[best]:.3f})")
+        return rows[best][1]
+
+
+@functools.cache
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide cache in the jobs directory, or None when disabled."""
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    settings.JOBS_OUTPUT_PATH.mkdir(parents=True, exist_ok=True)
+    return LLMCache(
+        settings.JOBS_OUTPUT_PATH / ".llm_cache.sqlite3",
+        settings.LLM_SEMANTIC_CACHE_THRESHOLD,
+        max_age_seconds=settings.LLM_CACHE_MAX_AGE_DAYS * 86400
+    )
+
+
+def cached_chat_completion(
+    client,
+    model: str,
+    system_message: str,
+    prompt: str,
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """Response content for a system + user prompt, served from the LLM cache when enabled."""
+    def create() -> str:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+
+    cache = get_llm_cache()
+    if cache is None:
+        return create()
+    return cache.get_or_set(client, model, system_message, prompt, temperature, max_tokens, create)
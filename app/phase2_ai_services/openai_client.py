@@ -1,15 +1,19 @@
-import json
 import logging
 import re
+import orjson
 from pathlib import Path
 from openai import OpenAI
 from typing import Tuple, Optional, List
 import requests
 
 from app.config import settings
+from app.utils.ffmpeg_utils import FFMPEG_QUIET_ARGS, get_ffmpeg_path
 
 logger = logging.getLogger(__name__)
 
+# timestamps.json is read by the renderer, not people; it is only indented when debugging
+TIMESTAMPS_JSON_OPTION = orjson.OPT_INDENT_2 if settings.PRETTY_TIMESTAMPS_JSON else 0
+
 
 def detect_book_genre(book_title: str) -> str:
     """
@@ -646,8 +650,7 @@ class OpenAIService:
         
         timestamps_data = transcription.model_dump()
         
-        with open(timestamps_path, "w", encoding="utf-8") as f:
-            json.dump(timestamps_data, f, indent=2, ensure_ascii=False)
+        timestamps_path.write_bytes(orjson.dumps(timestamps_data, option=TIMESTAMPS_JSON_OPTION))
             
         logger.info(f"Job {job_id}: Timestamps saved to {timestamps_path}")
         
@@ -689,10 +692,11 @@ class OpenAIService:
             # Normalize and clean each chunk before concatenation
             # This prevents static noise from level mismatches
             logger.debug(f"Job {job_id}: Processing chunk {i+1} audio - removing static and normalizing...")
-            ffmpeg_path = self._get_ffmpeg_path()
+            ffmpeg_path = get_ffmpeg_path()
             normalize_cmd = [
                 ffmpeg_path,
                 "-y",
+                *FFMPEG_QUIET_ARGS,
                 "-i", str(chunk_audio_raw),
                 "-af", "highpass=f=100,lowpass=f=15000,anlmdn=s=0.0001",  # Remove low-freq static, light denoise
                 "-ar", "44100",
@@ -700,7 +704,7 @@ class OpenAIService:
                 "-b:a", "192k",
                 str(chunk_audio)
             ]
-            subprocess.run(normalize_cmd, check=True, capture_output=True, text=True)
+            subprocess.run(normalize_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
             logger.debug(f"Job {job_id}: Chunk {i+1} audio processed (static removal and normalization applied)")
             
             # Clean up raw chunk
@@ -741,22 +745,22 @@ class OpenAIService:
         
         # Combine audio files using ffmpeg
         logger.info(f"Job {job_id}: Combining {len(chunk_audio_files)} audio chunks...")
-        ffmpeg_path = self._get_ffmpeg_path()
+        ffmpeg_path = get_ffmpeg_path()
         
-        # Create concat file for ffmpeg
-        concat_file = audio_path.parent / "concat_list.txt"
-        with open(concat_file, "w") as f:
-            for chunk_file in chunk_audio_files:
-                f.write(f"file '{chunk_file.absolute()}'\n")
+        # Concat list is fed to ffmpeg on stdin, so no list file is left behind on failure.
+        # Entries need the file: prefix, otherwise they resolve relative to pipe:
+        concat_text = "".join(f"file 'file:{chunk_file.absolute()}'\n" for chunk_file in chunk_audio_files)
         
         # Concatenate audio files with normalization and smooth transitions
         # Normalize all chunks to same level and re-encode for smooth boundaries
         cmd = [
             ffmpeg_path,
             "-y",
+            *FFMPEG_QUIET_ARGS,
             "-f", "concat",
             "-safe", "0",
-            "-i", str(concat_file),
+            "-protocol_whitelist", "file,pipe",
+            "-i", "pipe:0",
             "-af", "loudnorm=I=-16:TP=-1.5:LRA=11,highpass=f=100",  # Normalize and remove low-freq static
             "-c:a", "libmp3lame",
             "-b:a", "192k",
@@ -765,14 +769,12 @@ class OpenAIService:
             str(audio_path)
         ]
         
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        subprocess.run(cmd, input=concat_text, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
         
-        # Clean up chunk files and concat file
+        # Clean up chunk files
         for chunk_file in chunk_audio_files:
             if chunk_file.exists():
                 chunk_file.unlink()
-        if concat_file.exists():
-            concat_file.unlink()
         
         # Save combined timestamps
         combined_data = {
@@ -783,24 +785,8 @@ class OpenAIService:
             "segments": all_segments
         }
         
-        with open(timestamps_path, "w", encoding="utf-8") as f:
-            json.dump(combined_data, f, indent=2, ensure_ascii=False)
+        timestamps_path.write_bytes(orjson.dumps(combined_data, option=TIMESTAMPS_JSON_OPTION))
         
         logger.info(f"Job {job_id}: Combined audio and timestamps saved")
         
         return audio_path, timestamps_path
-    
-    def _get_ffmpeg_path(self) -> str:
-        """Get the path to ffmpeg executable."""
-        import shutil
-        try:
-            import imageio_ffmpeg
-            return imageio_ffmpeg.get_ffmpeg_exe()
-        except ImportError:
-            pass
-        
-        ffmpeg_path = shutil.which("ffmpeg")
-        if ffmpeg_path:
-            return ffmpeg_path
-        
-        raise FileNotFoundError("FFmpeg not found. Please install ffmpeg.")
\ No newline at end of file
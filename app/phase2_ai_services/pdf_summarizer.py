@@ -3,21 +3,458 @@ PDF summarization service for generating extensive summaries of entire PDFs.
 Uses GPT-4o-mini to create comprehensive summaries (minimum 10k words).
 Handles large PDFs by chunking when necessary.
 """
+import functools
+import itertools
 import logging
+import math
+import random
 import re
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple, List
-from openai import OpenAI
+from typing import Callable, Dict, Iterable, Iterator, Tuple, List, Optional
+
+import httpx
+import orjson
+from openai import APIConnectionError, APIStatusError, OpenAI, RateLimitError
 
 from app.config import settings
+from app.phase2_ai_services.llm_cache import get_llm_cache
 
 logger = logging.getLogger(__name__)
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Chunk summaries are requested concurrently; the rate limiter decides the actual pace
+SUMMARY_CHUNK_WORKERS = 4
+
+# Retry logic for rate limit errors: exponential backoff with jitter
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 2  # seconds, doubled on every attempt
+MAX_RETRY_DELAY = 60
+
+# Chunk sizing follows the TPM limit the limiter currently believes in
+MODEL_CONTEXT_TOKENS = 128_000  # gpt-4o-mini
+MAX_OUTPUT_TOKENS = 12_000  # Largest max_tokens sent with a chunk-sized input (single summary)
+MIN_INPUT_TOKENS = 4_000
+MIN_TPM_LIMIT = 10_000
+
+# Consecutive small chunks are summarized together in one request
+CHUNK_MAX_OUTPUT_TOKENS = 8_000
+MODEL_MAX_OUTPUT_TOKENS = 16_384  # gpt-4o-mini completion limit; caps chunks per batch
+
+# Long summaries are written in several parts sized up front, instead of being expanded afterwards
+TOKENS_PER_WORD = 1.35  # English narration with the gpt-4o tokenizer
+OUTPUT_TOKEN_SAFETY = 1.2
+PART_CONTEXT_WORDS = 150  # Tail of the previous part shown to the next one for continuity
+
+# Long generations are streamed and report progress every this many words
+STREAM_PROGRESS_WORDS = 1_000
+
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+_INLINE_SPACE_RE = re.compile(r'[ \t\f\v]+')
+_EXTRA_BLANK_LINES_RE = re.compile(r'\n{3,}')
+# Arabic only: a bare roman numeral is as likely to be a chapter title ("IV") as a page number
+_PAGE_NUMBER_RE = re.compile(r'(?:page\s+)?\d+(?:\s*(?:of|/)\s*\d+)?', re.IGNORECASE)
+# Chapter/part headings repeat like running headers once digits are masked, but are content
+_HEADING_RE = re.compile(r'(?:chapter|part|section|book)\s+\w+', re.IGNORECASE)
+_DIGITS_RE = re.compile(r'\d+')
+
+# Paragraphs are tokenized in batches of this size while the chunker walks the text
+PARAGRAPH_BATCH_SIZE = 256
+
+# Short lines repeated this often next to page breaks are running headers/footers
+# (numbers masked, so "The Great Book | 41" repeats)
+BOILERPLATE_MIN_REPEATS = 5
+BOILERPLATE_MAX_LINE_CHARS = 80
+_SENTENCE_END_RE = re.compile(r'([.!?]\s+)')  # Captured so the punctuation stays with its sentence
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket pacing OpenAI calls against per-minute token and request limits.
+    
+    Each call reserves its input estimate plus max_tokens, which is how OpenAI counts
+    a request against the TPM limit. Both buckets refill continuously. The limits start
+    from settings and then follow what the API reports: the x-ratelimit-* response
+    headers, the tokens a request actually used, and 429s.
+    """
+    
+    def __init__(self, tokens_per_minute: int, requests_per_minute: int):
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        self._tokens = float(tokens_per_minute)
+        self._requests = float(requests_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        """Add what both buckets regained since the last update (caller holds the lock)."""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+    
+    def _wait_time(self, tokens: int) -> float:
+        """Seconds until a request of this size fits (caller holds the lock)."""
+        return max(
+            0.0,
+            (tokens - self._tokens) * 60 / self.tokens_per_minute,
+            (1 - self._requests) * 60 / self.requests_per_minute
+        )
+    
+    def wait_time(self, tokens: int) -> float:
+        """Seconds acquire(tokens) would currently block for."""
+        with self._lock:
+            self._refill()
+            return self._wait_time(min(tokens, self.tokens_per_minute))
+    
+    def acquire(self, tokens: int):
+        """Block until the request fits in both buckets, then take it out of them."""
+        # A request larger than the whole bucket waits for a full bucket
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens and self._requests >= 1:
+                    self._tokens -= tokens
+                    self._requests -= 1
+                    return
+                wait = self._wait_time(tokens)
+            logger.info(f"Waiting {wait:.1f} seconds to respect rate limits...")
+            time.sleep(wait)
+    
+    def record_usage(self, reserved: int, used: int):
+        """Give back the part of a reservation the request didn't use (max_tokens is rarely reached)."""
+        with self._lock:
+            self._tokens = min(self.tokens_per_minute, self._tokens + max(0, reserved - used))
+    
+    def update_from_headers(self, headers):
+        """Adopt the limits and remaining capacity reported in OpenAI x-ratelimit-* headers."""
+        def header(name: str) -> Optional[float]:
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+        
+        limit_tokens = header("x-ratelimit-limit-tokens")
+        limit_requests = header("x-ratelimit-limit-requests")
+        remaining_tokens = header("x-ratelimit-remaining-tokens")
+        remaining_requests = header("x-ratelimit-remaining-requests")
+        with self._lock:
+            if limit_tokens and int(limit_tokens) != self.tokens_per_minute:
+                logger.info(f"OpenAI token limit detected: {int(limit_tokens):,} TPM")
+                self.tokens_per_minute = int(limit_tokens)
+            if limit_requests:
+                self.requests_per_minute = int(limit_requests)
+            # Other clients share the key, so the server's view of what's left wins when it's lower
+            if remaining_tokens is not None:
+                self._tokens = min(self._tokens, remaining_tokens)
+            if remaining_requests is not None:
+                self._requests = min(self._requests, remaining_requests)
+    
+    def on_rate_limited(self):
+        """Halve the token limit and empty the bucket after a 429; headers restore the limit later."""
+        with self._lock:
+            self.tokens_per_minute = max(MIN_TPM_LIMIT, self.tokens_per_minute // 2)
+            self._tokens = 0.0
+            logger.warning(f"Rate limited; pacing at {self.tokens_per_minute:,} TPM")
+    
+    def current_input_budget(self) -> int:
+        """Largest input a single request can carry and still fit in one minute of tokens."""
+        budget = min(MODEL_CONTEXT_TOKENS, self.tokens_per_minute) - MAX_OUTPUT_TOKENS
+        # Leave headroom for the prompt template and tokenizer estimate drift
+        return max(MIN_INPUT_TOKENS, int(budget * 0.9))
+
+
+@functools.cache
+def _get_client(api_key: str) -> OpenAI:
+    """
+    Process-wide OpenAI client with a pooled HTTP client.
+    
+    Reused across jobs so TLS connections stay warm; the pool has a keep-alive
+    connection for every concurrent chunk request.
+    """
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=SUMMARY_CHUNK_WORKERS * 2,
+            max_keepalive_connections=SUMMARY_CHUNK_WORKERS * 2
+        ),
+        # Non-streamed chunk summaries take minutes; only connecting should fail fast
+        timeout=httpx.Timeout(600, connect=10)
+    )
+    # SDK retries would bypass the token bucket; _retry_with_backoff retries through it
+    return OpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+
+
+@functools.cache
+def _get_deployments() -> List[Tuple[OpenAI, _TokenBucket]]:
+    """
+    Process-wide (client, rate limiter) pair for each configured API key.
+    
+    Rate limits apply per key (per project/organization), not per summary, so every
+    key gets its own limiter and requests are spread over the keys.
+    """
+    api_keys = [settings.OPENAI_API_KEY] + [
+        key.strip() for key in settings.OPENAI_EXTRA_API_KEYS.split(",") if key.strip()
+    ]
+    return [
+        (_get_client(api_key), _TokenBucket(settings.OPENAI_TPM_LIMIT, settings.OPENAI_RPM_LIMIT))
+        for api_key in dict.fromkeys(api_keys)
+    ]
+
+
+def _current_input_budget() -> int:
+    """Input budget of the key with the most headroom; _send_request routes big requests to it."""
+    return max(limiter.current_input_budget() for _, limiter in _get_deployments())
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Whether an OpenAI error is a retryable 429 (exhausted quota is not; waiting won't refill it)."""
+    return isinstance(error, RateLimitError) and getattr(error, "code", None) != "insufficient_quota"
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Whether an OpenAI error is a connection failure or a retryable server status (408, 409, 5xx)."""
+    if isinstance(error, APIConnectionError):
+        return True
+    return isinstance(error, APIStatusError) and (error.status_code in (408, 409) or error.status_code >= 500)
+
+
+def _retry_with_backoff(func):
+    """
+    Retry func on rate limit and transient errors with exponential backoff and jitter.
+    
+    The jitter keeps concurrent chunk requests from retrying in lockstep.
+    Other errors are re-raised immediately.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(MAX_RETRIES):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                rate_limited = _is_rate_limit_error(e)
+                if not rate_limited and not _is_transient_error(e):
+                    raise
+                reason = "Rate limit hit" if rate_limited else f"Transient error ({type(e).__name__})"
+                if attempt == MAX_RETRIES - 1:
+                    logger.error(f"{reason} after {MAX_RETRIES} attempts")
+                    raise
+                wait_time = min(MAX_RETRY_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.random()
+                logger.warning(f"{reason}, waiting {wait_time:.1f} seconds before retry {attempt + 2}/{MAX_RETRIES}...")
+                time.sleep(wait_time)
+    return wrapper
+
+
+def _send_request(prompt_tokens: int, **kwargs) -> Tuple[any, int, _TokenBucket]:
+    """
+    Send a chat completion request through the key whose rate limiter has room for it soonest.
+    
+    Returns:
+        Parsed response (a stream when stream=True), the number of tokens reserved
+        for it, and the limiter of the key that served it
+    """
+    reserved = prompt_tokens + kwargs["max_tokens"]
+    deployments = _get_deployments()
+    # Keys whose whole minute of tokens can't hold the request would only answer with a 429
+    fitting = [deployment for deployment in deployments if deployment[1].tokens_per_minute >= reserved]
+    client, limiter = min(fitting or deployments, key=lambda deployment: deployment[1].wait_time(reserved))
+    limiter.acquire(reserved)
+    try:
+        # The raw response exposes the rate limit headers alongside the parsed completion
+        raw_response = client.chat.completions.with_raw_response.create(**kwargs)
+    except Exception as e:
+        if _is_rate_limit_error(e):
+            limiter.on_rate_limited()
+        raise
+    limiter.update_from_headers(raw_response.headers)
+    return raw_response.parse(), reserved, limiter
+
+
+def _record_usage(limiter: _TokenBucket, reserved: int, usage):
+    """Settle a request's reservation and log how much of its prompt OpenAI served from cache."""
+    limiter.record_usage(reserved, usage.total_tokens)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) or 0
+    logger.debug(f"Prompt tokens: {usage.prompt_tokens:,} ({cached_tokens:,} cached)")
+
+
+@_retry_with_backoff
+def _create_completion(prompt_tokens: int, **kwargs):
+    """
+    Call chat.completions.create paced by the rate limiters, retrying on rate limit errors.
+    
+    Args:
+        prompt_tokens: Estimated input tokens of the request
+        **kwargs: Arguments for chat.completions.create (must include max_tokens)
+    """
+    response, reserved, limiter = _send_request(prompt_tokens, **kwargs)
+    if response.usage:
+        _record_usage(limiter, reserved, response.usage)
+    return response
+
+
+@_retry_with_backoff
+def _stream_completion(prompt_tokens: int, **kwargs) -> str:
+    """
+    Like _create_completion, but streams the response and returns its content.
+    
+    Multi-thousand-word summaries take minutes to generate; streaming logs their
+    progress instead of leaving the request silent until the last token.
+    """
+    stream, reserved, limiter = _send_request(
+        prompt_tokens, stream=True, stream_options={"include_usage": True}, **kwargs
+    )
+    parts = []
+    word_count = 0
+    next_report = STREAM_PROGRESS_WORDS
+    for chunk in stream:
+        # The final chunk carries usage and no choices
+        if chunk.usage:
+            _record_usage(limiter, reserved, chunk.usage)
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            continue
+        delta = chunk.choices[0].delta.content
+        parts.append(delta)
+        word_count += len(delta.split())
+        if word_count >= next_report:
+            logger.info(f"Streaming summary: ~{word_count:,} words so far...")
+            next_report += STREAM_PROGRESS_WORDS
+    return "".join(parts)
+
+
+def _complete(
+    client: OpenAI,
+    model: str,
+    system_message: str,
+    prompt: str,
+    max_tokens: int,
+    temperature: float = 0.7,
+    response_format: Optional[Dict] = None,
+    stream: bool = False,
+    validate: Optional[Callable[[str], bool]] = None,
+    semantic: bool = True
+) -> str:
+    """
+    Response content for a system + user prompt, served from the LLM cache when possible.
+    
+    validate and semantic are passed to LLMCache.get_or_set: content failing
+    validate is not cached, and semantic=False limits the prompt to exact hits.
+    """
+    def create() -> str:
+        extra = {"response_format": response_format} if response_format else {}
+        request = dict(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra
+        )
+        prompt_tokens = _estimate_tokens(system_message) + _estimate_tokens(prompt)
+        if stream:
+            return _stream_completion(prompt_tokens, **request)
+        response = _create_completion(prompt_tokens, **request)
+        return response.choices[0].message.content
+    
+    cache = get_llm_cache()
+    if cache is None:
+        return create()
+    return cache.get_or_set(
+        client, model, system_message, prompt, temperature, max_tokens, create,
+        validate=validate, semantic=semantic
+    )
+
+
+@functools.cache
+def _get_encoding():
+    """
+    gpt-4o-mini tokenizer, or None when tiktoken can't provide it.
+    
+    tiktoken downloads the BPE table on first use, so this can fail on offline hosts.
+    """
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, estimating tokens from text length: {e}")
+        return None
+
+
+def _preclean_text(text: str) -> str:
+    """
+    Drop page numbers and running headers/footers and collapse whitespace before tokenizing.
+    
+    A line counts as boilerplate when it is a bare page number, or when it sits next to
+    a blank line (pages are joined by one, so headers and footers always do), is short,
+    has no sentence-ending punctuation (so repeated dialogue like "Yes." survives) and
+    recurs at least BOILERPLATE_MIN_REPEATS times at such positions with its digits
+    masked. Chapter, part and section headings are never dropped.
+    """
+    lines = [_INLINE_SPACE_RE.sub(' ', line).strip() for line in text.split('\n')]
+    last = len(lines) - 1
+    
+    def boilerplate_key(index: int) -> Optional[str]:
+        line = lines[index]
+        if not line or len(line) > BOILERPLATE_MAX_LINE_CHARS or line[-1] in '.!?"\'\u201d\u2019:;,':
+            return None
+        if not (index == 0 or index == last or not lines[index - 1] or not lines[index + 1]):
+            return None
+        if _HEADING_RE.match(line):
+            return None
+        return _DIGITS_RE.sub('#', line.lower())
+    
+    keys = [boilerplate_key(index) for index in range(len(lines))]
+    counts = Counter(key for key in keys if key)
+    kept = [
+        line for line, key in zip(lines, keys)
+        if not _PAGE_NUMBER_RE.fullmatch(line)
+        and counts.get(key, 0) < BOILERPLATE_MIN_REPEATS
+    ]
+    return _EXTRA_BLANK_LINES_RE.sub('\n\n', '\n'.join(kept)).strip()
+
 
 def _estimate_tokens(text: str) -> int:
-    """Estimate token count (roughly 1 token = 4 characters for English)."""
-    return len(text) // 4
+    """Count tokens with the gpt-4o-mini tokenizer (roughly 1 token = 4 characters without it)."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _estimate_tokens_batch(texts: List[str]) -> List[int]:
+    """_estimate_tokens for many texts, encoded in one multi-threaded tiktoken call."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return [len(text) // 4 for text in texts]
+    return [len(tokens) for tokens in encoding.encode_batch(texts, disallowed_special=())]
+
+
+def _iter_paragraphs(text: str) -> Iterator[str]:
+    """Paragraphs of text (split at blank lines), without building the whole list."""
+    start = 0
+    for match in _PARAGRAPH_BREAK_RE.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+
+def _iter_with_token_counts(texts: Iterable[str]) -> Iterator[Tuple[str, int]]:
+    """Pair each text with its token count, tokenizing PARAGRAPH_BATCH_SIZE texts at a time."""
+    iterator = iter(texts)
+    while batch := list(itertools.islice(iterator, PARAGRAPH_BATCH_SIZE)):
+        yield from zip(batch, _estimate_tokens_batch(batch))
 
 
 def _split_text_into_chunks(text: str, max_tokens: int) -> List[str]:
@@ -25,19 +462,12 @@ def _split_text_into_chunks(text: str, max_tokens: int) -> List[str]:
     Split text into chunks that fit within token limit.
     Tries to split at paragraph boundaries to maintain context.
     """
-    estimated_tokens = _estimate_tokens(text)
-    if estimated_tokens <= max_tokens:
-        return [text]
-    
     chunks = []
-    # Split by paragraphs (double newlines)
-    paragraphs = re.split(r'\n\s*\n', text)
     current_chunk = []
     current_tokens = 0
     
-    for paragraph in paragraphs:
-        para_tokens = _estimate_tokens(paragraph)
-        
+    # Walk paragraphs (double newlines) lazily, tokenizing them in batches
+    for paragraph, para_tokens in _iter_with_token_counts(_iter_paragraphs(text)):
         # If single paragraph is too large, split it by sentences
         if para_tokens > max_tokens:
             # Flush current chunk if it has content
@@ -47,14 +477,9 @@ def _split_text_into_chunks(text: str, max_tokens: int) -> List[str]:
                 current_tokens = 0
             
             # Split large paragraph by sentences
-            sentences = re.split(r'([.!?]\s+)', paragraph)
-            for i in range(0, len(sentences), 2):
-                if i + 1 < len(sentences):
-                    sentence = sentences[i] + sentences[i + 1]
-                else:
-                    sentence = sentences[i]
-                
-                sent_tokens = _estimate_tokens(sentence)
+            parts = _SENTENCE_END_RE.split(paragraph)
+            sentences = [''.join(parts[i:i + 2]) for i in range(0, len(parts), 2)]
+            for sentence, sent_tokens in zip(sentences, _estimate_tokens_batch(sentences)):
                 if current_tokens + sent_tokens > max_tokens and current_chunk:
                     chunks.append('\n\n'.join(current_chunk))
                     current_chunk = [sentence]
@@ -76,6 +501,9 @@ def _split_text_into_chunks(text: str, max_tokens: int) -> List[str]:
     if current_chunk:
         chunks.append('\n\n'.join(current_chunk))
     
+    # Everything fit in one chunk: keep the text exactly as it was
+    if len(chunks) == 1:
+        return [text]
     return chunks
 
 
@@ -89,11 +517,8 @@ def _generate_chunk_summary(
     system_message: str
 ) -> str:
     """Generate a summary for a single chunk with rate limiting."""
-    import time
-    
-    prompt = f"""You are summarizing part {chunk_index + 1} of {total_chunks} from the book "{pdf_filename}".
-
-Create a detailed, comprehensive summary of this section. Include:
+    # Static instructions first and per-request details last, so requests share a cacheable prefix
+    prompt = f"""Create a detailed, comprehensive summary of the book section below. Include:
 - Key plot points and events
 - Character development and interactions
 - Important themes and insights
@@ -101,6 +526,8 @@ Create a detailed, comprehensive summary of this section. Include:
 
 Write in a narrative style suitable for voice narration. Be thorough and detailed.
 
+You are summarizing part {chunk_index + 1} of {total_chunks} from the book "{pdf_filename}".
+
 Section content:
 {chunk_text}
 
@@ -108,52 +535,106 @@ Summary of this section:"""
     
     logger.info(f"Generating summary for chunk {chunk_index + 1}/{total_chunks}...")
     
-    # Add delay between chunks to respect rate limits
-    # With 30k TPM limit, we need to space out requests
-    if chunk_index > 0:
-        delay = 5  # 5 seconds delay between chunks to respect 30k TPM limit
-        logger.info(f"Waiting {delay} seconds to respect rate limits...")
-        time.sleep(delay)
-    
-    # Retry logic for rate limit errors
-    max_retries = 3
-    retry_delay = 10  # 10 seconds
-    
-    # For chunk summaries, use smaller output to stay under 30k TPM
-    # Input ~10k + output ~8k = ~18k total (safe)
-    chunk_max_output_tokens = 8000
-    
-    for attempt in range(max_retries):
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=chunk_max_output_tokens
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            error_str = str(e)
-            if "rate_limit" in error_str.lower() or "429" in error_str:
-                if attempt < max_retries - 1:
-                    wait_time = retry_delay * (attempt + 1)  # Exponential backoff
-                    logger.warning(f"Rate limit hit, waiting {wait_time} seconds before retry {attempt + 2}/{max_retries}...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.error(f"Rate limit error after {max_retries} attempts")
-                    raise
-            else:
-                # Not a rate limit error, re-raise immediately
-                raise
+    # Chunk inputs are sized so input + this output stays under the TPM limit
+    return _complete(client, model, system_message, prompt, max_tokens=CHUNK_MAX_OUTPUT_TOKENS).strip()
+
+
+def _group_chunks(chunks: List[str], max_input_tokens: int) -> List[List[int]]:
+    """
+    Group consecutive chunk indices so each group fits in one request.
+    
+    A group's input plus one output allowance per chunk must fit the budget of a
+    single-summary request, and its outputs must fit the model's completion limit.
+    """
+    request_budget = max_input_tokens + MAX_OUTPUT_TOKENS
+    max_per_group = MODEL_MAX_OUTPUT_TOKENS // CHUNK_MAX_OUTPUT_TOKENS
+    
+    groups = []
+    current_group = []
+    current_tokens = 0
+    for i, chunk in enumerate(chunks):
+        chunk_tokens = _estimate_tokens(chunk) + CHUNK_MAX_OUTPUT_TOKENS
+        if current_group and (
+            current_tokens + chunk_tokens > request_budget or len(current_group) >= max_per_group
+        ):
+            groups.append(current_group)
+            current_group = []
+            current_tokens = 0
+        current_group.append(i)
+        current_tokens += chunk_tokens
+    if current_group:
+        groups.append(current_group)
+    return groups
+
+
+def _parse_chunk_summaries(content: str, count: int) -> Optional[List[str]]:
+    """The count summaries in a batched JSON response, or None if it is malformed."""
+    try:
+        summaries = orjson.loads(content)["summaries"]
+        if len(summaries) == count and all(isinstance(summary, str) for summary in summaries):
+            return [summary.strip() for summary in summaries]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _generate_chunk_summaries(
+    client: OpenAI,
+    model: str,
+    chunks: List[str],
+    chunk_indices: List[int],
+    pdf_filename: str,
+    system_message: str
+) -> List[str]:
+    """
+    Summarize a group of chunks in one request, returning one summary per chunk.
     
-    # Should never reach here, but just in case
-    raise Exception("Failed to generate chunk summary after retries")
+    The model answers with a JSON object holding the summaries in order. A single
+    chunk, or a malformed answer, goes through _generate_chunk_summary instead.
+    """
+    total_chunks = len(chunks)
+    if len(chunk_indices) == 1:
+        return [_generate_chunk_summary(
+            client, model, chunks[chunk_indices[0]], chunk_indices[0], total_chunks, pdf_filename, system_message
+        )]
+    
+    sections = "\n\n".join(
+        f"[SECTION {n}] (part {i + 1} of {total_chunks})\n{chunks[i]}"
+        for n, i in enumerate(chunk_indices, start=1)
+    )
+    prompt = f"""You are summarizing {len(chunk_indices)} consecutive parts of the book "{pdf_filename}".
+
+Create a detailed, comprehensive summary of each section separately. Include:
+- Key plot points and events
+- Character development and interactions
+- Important themes and insights
+- Significant details and descriptions
+
+Write in a narrative style suitable for voice narration. Be thorough and detailed.
+
+Return a JSON object with a key "summaries" holding a list of {len(chunk_indices)} strings, one summary per section, in section order.
+
+{sections}"""
+    
+    first, last = chunk_indices[0] + 1, chunk_indices[-1] + 1
+    logger.info(f"Generating summaries for chunks {first}-{last}/{total_chunks} in one request...")
+    
+    content = _complete(
+        client, model, system_message, prompt,
+        max_tokens=CHUNK_MAX_OUTPUT_TOKENS * len(chunk_indices),
+        response_format={"type": "json_object"},
+        # Malformed answers are not cached, so a rerun asks again instead of replaying them
+        validate=lambda content: _parse_chunk_summaries(content, len(chunk_indices)) is not None
+    )
+    summaries = _parse_chunk_summaries(content, len(chunk_indices))
+    if summaries is not None:
+        return summaries
+    
+    logger.warning(f"Unusable batched response for chunks {first}-{last}, summarizing them one by one")
+    return [
+        _generate_chunk_summary(client, model, chunks[i], i, total_chunks, pdf_filename, system_message)
+        for i in chunk_indices
+    ]
 
 
 def generate_pdf_summary(
@@ -183,7 +664,8 @@ def generate_pdf_summary(
             "Please set OPENAI_API_KEY in your .env file."
         )
     
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    # Requests are routed over every configured key; this client also serves cache embeddings
+    client = _get_deployments()[0][0]
     # Use GPT-4o-mini which has better rate limits and is more cost-effective
     # It still has 128k context tokens, so it can handle large PDFs
     model = "gpt-4o-mini"
@@ -191,14 +673,16 @@ def generate_pdf_summary(
     logger.info(f"Generating PDF summary using {model} (minimum {min_words:,} words)...")
     logger.info(f"PDF text length: {len(pdf_text)} characters")
     
+    # Page numbers and running headers cost tokens on every page without adding content
+    pdf_text = _preclean_text(pdf_text)
+    logger.info(f"PDF text length after removing boilerplate: {len(pdf_text)} characters")
+    
     # GPT-4o-mini has 128k context tokens
     # But we need to respect rate limits (TPM - tokens per minute)
-    # If user has 30k TPM limit, we need to keep TOTAL tokens (input + output) under 30k
-    # For chunk summaries: input ~10k + output ~8k = ~18k total (safe)
-    # For final summary: input ~20k + output ~16k = ~36k (might exceed, so we'll reduce output)
-    # Use smaller chunks to ensure we stay well under 30k TPM limit
-    max_input_tokens = 10_000  # Very conservative limit to respect 30k TPM
-    max_input_chars = max_input_tokens * 4  # ~40k characters per chunk
+    # Input + output of every request must fit in one minute of tokens, so the input
+    # budget follows the limiter: ~16k at 30k TPM, more once the API reports a higher limit
+    max_input_tokens = _current_input_budget()
+    logger.info(f"Input budget per request: {max_input_tokens:,} tokens")
     
     estimated_tokens = _estimate_tokens(pdf_text)
     logger.info(f"Estimated tokens: {estimated_tokens:,}")
@@ -224,24 +708,33 @@ def generate_pdf_summary(
             # PDF is too large - need to chunk it
             logger.info(f"PDF is too large ({estimated_tokens:,} tokens), splitting into chunks...")
             chunks = _split_text_into_chunks(pdf_text, max_input_tokens)
-            logger.info(f"Split PDF into {len(chunks)} chunks")
+            groups = _group_chunks(chunks, max_input_tokens)
+            logger.info(f"Split PDF into {len(chunks)} chunks ({len(groups)} requests)")
             
-            # Generate summary for each chunk
+            # Generate summary for each chunk group; requests run concurrently, paced by the rate limiter
             chunk_summaries = []
-            for i, chunk in enumerate(chunks):
-                try:
-                    chunk_summary = _generate_chunk_summary(
-                        client, model, chunk, i, len(chunks), pdf_filename, system_message
-                    )
-                    chunk_summaries.append(chunk_summary)
-                    logger.info(f"Completed chunk {i + 1}/{len(chunks)}")
-                except Exception as e:
-                    logger.error(f"Error processing chunk {i + 1}: {e}")
-                    # Continue with other chunks, but log the error
-                    # We'll try to create a summary from the chunks we have
-                    if "rate_limit" in str(e).lower():
-                        logger.error("Rate limit exceeded. Please try again later or upgrade your OpenAI plan.")
-                    raise
+            with ThreadPoolExecutor(max_workers=min(len(groups), SUMMARY_CHUNK_WORKERS)) as pool:
+                futures = [
+                    pool.submit(_generate_chunk_summaries, client, model, chunks, group, pdf_filename, system_message)
+                    for group in groups
+                ]
+                for group, future in zip(groups, futures):
+                    try:
+                        chunk_summaries.extend(future.result())
+                        logger.info(f"Completed chunk {group[-1] + 1}/{len(chunks)}")
+                    except Exception as e:
+                        logger.error(f"Error processing chunk {group[0] + 1}: {e}")
+                        if "rate_limit" in str(e).lower():
+                            logger.error("Rate limit exceeded. Please try again later or upgrade your OpenAI plan.")
+                        # Don't start chunks that are still queued
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+            
+            # Merge neighbouring summaries until they fit the final request
+            chunk_summaries = _reduce_summaries(
+                client, model, chunk_summaries, pdf_filename, system_message, max_input_tokens
+            )
             
             # Combine chunk summaries and create final comprehensive summary
             logger.info("Combining chunk summaries into final comprehensive summary...")
@@ -272,19 +765,26 @@ def generate_pdf_summary(
             words_needed = min_words - word_count
             target_words = min_words + (words_needed * 0.2)  # Add 20% buffer
             
-            summary_text = _expand_summary(
+            expanded_text = _expand_summary(
                 client, model, summary_text, int(target_words), system_message
             )
-            word_count = len(summary_text.split())
-            logger.info(f"After expansion {expansion_attempts}: {word_count:,} words")
+            expanded_word_count = len(expanded_text.split())
+            logger.info(f"After expansion {expansion_attempts}: {expanded_word_count:,} words")
             
-            # Add delay between expansion attempts to respect rate limits
-            if expansion_attempts < max_expansion_attempts and word_count < min_words:
-                time.sleep(3)  # 3 second delay
+            # Keep the longest version; a rewrite that shrank the text is discarded
+            gained_words = expanded_word_count - word_count
+            if gained_words > 0:
+                summary_text = expanded_text
+                word_count = expanded_word_count
+            
+            # The model is rewriting rather than adding; further attempts won't get much further
+            if gained_words < max(200, 0.05 * words_needed):
+                logger.warning(f"Expansion added only {gained_words:,} words, stopping expansion attempts")
+                break
         
         if word_count < min_words:
             logger.warning(
-                f"Summary is still {word_count:,} words after {max_expansion_attempts} expansion attempts. "
+                f"Summary is still {word_count:,} words after {expansion_attempts} expansion attempts. "
                 f"Target was {min_words:,} words."
             )
         
@@ -317,10 +817,13 @@ def _generate_single_summary(
     system_message: str
 ) -> str:
     """Generate summary for a PDF that fits in a single API call."""
-    prompt = f"""Create a comprehensive, extensive summary of the entire book from the PDF file "{pdf_filename}".
+    # The word target and part instruction come after the PDF text, so all parts share
+    # one long prompt prefix that OpenAI's prompt cache can serve
+    def build_prompt(words: int, part_note: str) -> str:
+        return f"""Create a comprehensive, extensive summary of the entire book from the PDF file "{pdf_filename}".
 
 CRITICAL REQUIREMENTS - THESE ARE MANDATORY:
-1. The summary MUST be AT LEAST {min_words:,} words long - this is an absolute minimum requirement, not a suggestion
+1. The summary MUST reach the word count given at the end of this prompt - this is an absolute minimum requirement, not a suggestion
 2. Cover the ENTIRE book comprehensively - include ALL major plot points, themes, characters, and insights
 3. Write in a narrative, engaging style suitable for voice narration
 4. Maintain the book's tone and style as much as possible
@@ -337,24 +840,123 @@ Here is the full text from the PDF:
 
 {pdf_text}
 
-Now create the extensive summary. It MUST be at least {min_words:,} words - be thorough and detailed:"""
+{part_note}Now create the extensive summary. It MUST be at least {words:,} words - be thorough and detailed:"""
     
     logger.info("Calling OpenAI API for summary generation...")
-    # For single summary, reduce output tokens to stay under 30k TPM
-    # Input ~10k + output ~12k = ~22k total (safe)
-    single_summary_max_output = 12000
-    
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=single_summary_max_output
-    )
+    return _generate_in_parts(client, model, system_message, min_words, build_prompt)
+
+
+def _generate_in_parts(
+    client: OpenAI,
+    model: str,
+    system_message: str,
+    min_words: int,
+    build_prompt: Callable[[int, str], str]
+) -> str:
+    """
+    Generate a summary of at least min_words, in as many sequential parts as its length needs.
+    
+    One request can't produce more than MAX_OUTPUT_TOKENS, so longer summaries are
+    split up front; each part sees the end of the previous one to continue from it.
+    
+    Args:
+        build_prompt: Returns the prompt for a given word target and part instruction
+                      (an empty instruction when the summary fits in one request)
+    """
+    target_tokens = min_words * TOKENS_PER_WORD * OUTPUT_TOKEN_SAFETY
+    total_parts = math.ceil(target_tokens / MAX_OUTPUT_TOKENS)
+    if total_parts <= 1:
+        prompt = build_prompt(min_words, "")
+        return _complete(client, model, system_message, prompt, max_tokens=MAX_OUTPUT_TOKENS, stream=True).strip()
+    
+    part_words = math.ceil(min_words / total_parts)
+    logger.info(f"Writing the summary in {total_parts} parts of at least {part_words:,} words each...")
+    parts = []
+    for part in range(1, total_parts + 1):
+        if part == 1:
+            part_note = (
+                f"This request writes PART 1 of {total_parts} of the summary. Cover only the first "
+                f"1/{total_parts} of the book and stop at a natural break - do not conclude the story.\n\n"
+            )
+        else:
+            previous_tail = " ".join(parts[-1].split()[-PART_CONTEXT_WORDS:])
+            coverage = (
+                "through to the end of the book, and conclude it" if part == total_parts
+                else f"the next 1/{total_parts} of the book, and stop at a natural break - do not conclude the story"
+            )
+            part_note = (
+                f"This request writes PART {part} of {total_parts} of the summary. The previous part ends with:\n"
+                f"\"...{previous_tail}\"\n"
+                f"Continue directly from that point without repeating it or re-introducing the book, "
+                f"covering {coverage}.\n\n"
+            )
+        logger.info(f"Generating summary part {part}/{total_parts}...")
+        prompt = build_prompt(part_words, part_note)
+        # Part prompts differ only in the part note, so only exact cache hits are safe
+        parts.append(_complete(
+            client, model, system_message, prompt, max_tokens=MAX_OUTPUT_TOKENS, stream=True, semantic=False
+        ).strip())
+    return "\n\n".join(parts)
+
+
+def _merge_summaries(
+    client: OpenAI,
+    model: str,
+    first: str,
+    second: str,
+    pdf_filename: str,
+    system_message: str
+) -> str:
+    """Merge the summaries of two consecutive sections into one section summary."""
+    prompt = f"""Below are summaries of two consecutive sections of the book "{pdf_filename}".
+
+Merge them into a single detailed summary covering both sections, in order. Keep:
+- Key plot points and events
+- Character development and interactions
+- Important themes and insights
+- Significant details and descriptions
+
+Write in a narrative style suitable for voice narration. Remove repetition, but do not drop events or characters.
+
+First section summary:
+{first}
+
+Second section summary:
+{second}
+
+Merged summary:"""
     
-    return response.choices[0].message.content.strip()
+    return _complete(client, model, system_message, prompt, max_tokens=CHUNK_MAX_OUTPUT_TOKENS).strip()
+
+
+def _reduce_summaries(
+    client: OpenAI,
+    model: str,
+    summaries: List[str],
+    pdf_filename: str,
+    system_message: str,
+    max_input_tokens: int
+) -> List[str]:
+    """
+    Merge adjacent summaries pairwise, level by level, until together they fit max_input_tokens.
+    
+    Long books produce more section summaries than the final request can take in; each
+    level halves their number, and the merges within a level run concurrently.
+    """
+    level = 0
+    while len(summaries) > 1 and sum(_estimate_tokens(summary) for summary in summaries) > max_input_tokens:
+        level += 1
+        pairs = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        logger.info(f"Section summaries exceed the input budget, merging {len(summaries)} into {len(pairs)} (level {level})...")
+        
+        def merge(pair: List[str]) -> str:
+            if len(pair) == 1:
+                return pair[0]
+            return _merge_summaries(client, model, pair[0], pair[1], pdf_filename, system_message)
+        
+        with ThreadPoolExecutor(max_workers=min(len(pairs), SUMMARY_CHUNK_WORKERS)) as pool:
+            summaries = list(pool.map(merge, pairs))
+    return summaries
 
 
 def _generate_final_summary(
@@ -366,11 +968,13 @@ def _generate_final_summary(
     system_message: str
 ) -> str:
     """Generate final comprehensive summary from combined chunk summaries."""
-    prompt = f"""You have been given summaries of different sections of the book "{pdf_filename}". 
+    # The word target and part instruction come after the section summaries, as in _generate_single_summary
+    def build_prompt(words: int, part_note: str) -> str:
+        return f"""You have been given summaries of different sections of the book "{pdf_filename}". 
 Your task is to combine these into a single, comprehensive, extensive summary of the ENTIRE book.
 
 CRITICAL REQUIREMENTS - THESE ARE MANDATORY:
-1. The final summary MUST be AT LEAST {min_words:,} words long - this is an absolute minimum requirement
+1. The final summary MUST reach the word count given at the end of this prompt - this is an absolute minimum requirement
 2. Combine all sections seamlessly into a cohesive narrative
 3. Ensure ALL major plot points, themes, characters, and insights from all sections are included
 4. Write in a narrative, engaging style suitable for voice narration
@@ -386,36 +990,50 @@ Here are the section summaries:
 
 {combined_summaries}
 
-Now create the comprehensive final summary of the entire book. It MUST be at least {min_words:,} words - be thorough and detailed:"""
+{part_note}Now create the comprehensive final summary of the entire book. It MUST be at least {words:,} words - be thorough and detailed:"""
     
     logger.info("Calling OpenAI API to combine summaries into final comprehensive summary...")
-    # For final summary, we might have larger input, so reduce output tokens
-    # Try to keep total under 30k TPM
-    final_summary_max_output = 12000
-    
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=final_summary_max_output
-    )
+    # The section summaries were reduced to the input budget, which leaves room for each part's output
+    return _generate_in_parts(client, model, system_message, min_words, build_prompt)
+
+
+def _split_into_sections(text: str, count: int) -> List[str]:
+    """Split text at paragraph breaks into at most count sections of similar word count."""
+    paragraphs = [paragraph for paragraph in _PARAGRAPH_BREAK_RE.split(text) if paragraph.strip()]
+    total_words = sum(len(paragraph.split()) for paragraph in paragraphs)
     
-    return response.choices[0].message.content.strip()
+    sections = []
+    current_section = []
+    current_words = 0
+    for paragraph in paragraphs:
+        current_section.append(paragraph)
+        current_words += len(paragraph.split())
+        # Close a section once it reaches its share of the words read so far
+        if current_words * count >= total_words * (len(sections) + 1) and len(sections) < count - 1:
+            sections.append("\n\n".join(current_section))
+            current_section = []
+    if current_section:
+        sections.append("\n\n".join(current_section))
+    return sections
 
 
-def _expand_summary(
+def _expand_section(
     client: OpenAI,
     model: str,
-    summary_text: str,
+    section_text: str,
     target_words: int,
+    section_index: int,
+    total_sections: int,
     system_message: str
 ) -> str:
-    """Expand a summary that is too short."""
-    word_count = len(summary_text.split())
-    words_needed = target_words - word_count
+    """Expand one section of a summary that is too short."""
+    word_count = len(section_text.split())
+    words_needed = max(0, target_words - word_count)
+    scope_note = "" if total_sections == 1 else (
+        f"This is section {section_index + 1} of {total_sections} of a longer summary; the other sections are "
+        "expanded separately and joined back in order. Expand ONLY this section - do not add an introduction, "
+        "recap or conclusion for the book as a whole.\n\n"
+    )
     
     expansion_prompt = f"""CRITICAL: The summary is currently {word_count:,} words, but it MUST be expanded to at least {target_words:,} words. 
 This is a MINIMUM requirement - the summary should be comprehensive and detailed.
@@ -434,49 +1052,48 @@ The expansion should be substantial - you need to add approximately {words_neede
 Make it feel like a complete "mini book" that thoroughly covers the entire story with rich detail.
 This summary will be used for video narration, so it needs to be extensive.
 
-Current summary ({word_count:,} words):
-{summary_text}
+{scope_note}Current summary ({word_count:,} words):
+{section_text}
 
 Expanded summary (MUST be at least {target_words:,} words - this is critical):"""
     
-    # Use higher max_tokens for expansion to allow for longer output
-    expansion_max_output = 16000  # Use full 16k for expansion
-    
-    # Retry logic for rate limits
-    max_retries = 3
-    retry_delay = 10
-    
-    for attempt in range(max_retries):
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": expansion_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=expansion_max_output
-            )
-            
-            expanded_text = response.choices[0].message.content.strip()
-            expanded_word_count = len(expanded_text.split())
-            logger.info(f"Expansion generated {expanded_word_count:,} words (target: {target_words:,})")
-            
-            return expanded_text
-            
-        except Exception as e:
-            error_str = str(e)
-            if "rate_limit" in error_str.lower() or "429" in error_str:
-                if attempt < max_retries - 1:
-                    wait_time = retry_delay * (attempt + 1)
-                    logger.warning(f"Rate limit during expansion, waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.error(f"Rate limit error during expansion after {max_retries} attempts")
-                    raise
-            else:
-                raise
-    
-    raise Exception("Failed to expand summary after retries")
+    return _complete(client, model, system_message, expansion_prompt, max_tokens=CHUNK_MAX_OUTPUT_TOKENS).strip()
 
+
+def _expand_summary(
+    client: OpenAI,
+    model: str,
+    summary_text: str,
+    target_words: int,
+    system_message: str
+) -> str:
+    """
+    Expand a summary that is too short.
+    
+    The summary is split at paragraph breaks into as many sections as the target
+    length needs, and the sections are expanded concurrently, each to its share of
+    target_words, instead of rewriting the whole summary in one long request.
+    """
+    word_count = len(summary_text.split())
+    section_count = math.ceil(target_words * TOKENS_PER_WORD * OUTPUT_TOKEN_SAFETY / CHUNK_MAX_OUTPUT_TOKENS)
+    sections = _split_into_sections(summary_text, section_count)
+    if not sections:
+        # Nothing but whitespace to expand
+        logger.warning("Summary is empty; skipping expansion")
+        return summary_text
+    logger.info(f"Expanding summary in {len(sections)} sections...")
+    
+    def expand(index: int) -> str:
+        section_target = math.ceil(target_words * len(sections[index].split()) / max(1, word_count))
+        return _expand_section(
+            client, model, sections[index], section_target, index, len(sections), system_message
+        )
+    
+    with ThreadPoolExecutor(max_workers=min(len(sections), SUMMARY_CHUNK_WORKERS)) as pool:
+        expanded_sections = list(pool.map(expand, range(len(sections))))
+    
+    expanded_text = "\n\n".join(expanded_sections)
+    expanded_word_count = len(expanded_text.split())
+    logger.info(f"Expansion generated {expanded_word_count:,} words (target: {target_words:,})")
+    
+    return expanded_text
@@ -3,13 +3,16 @@ import logging
 from pathlib import Path
 from typing import List
 
+from app.utils.ffmpeg_utils import FFMPEG_QUIET_ARGS
+
 logger = logging.getLogger(__name__)
 
 def _run_ffmpeg_command(command: List[str]):
     """Helper function to run an FFmpeg command."""
+    command = [command[0], *FFMPEG_QUIET_ARGS, *command[1:]]
     try:
         logger.debug(f"Running command: {' '.join(command)}")
-        subprocess.run(command, check=True, capture_output=True, text=True)
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     except subprocess.CalledProcessError as e:
         logger.error("FFmpeg command failed!", exc_info=True)
         logger.error(f"FFmpeg STDERR: {e.stderr}")
@@ -1,14 +1,13 @@
-import json
 import logging
 import os
 import tempfile
 import multiprocessing
-import shutil
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple, Any
 from functools import partial
 
 import numpy as np
+import orjson
 from PIL import Image, ImageDraw, ImageFont
 from moviepy import AudioFileClip, CompositeVideoClip, VideoClip, ImageClip, ImageSequenceClip
 import moviepy.video.fx as vfx
@@ -16,6 +15,7 @@ from pydantic import BaseModel
 from tqdm import tqdm
 
 from app.config import settings
+from app.utils.ffmpeg_utils import FFMPEG_QUIET_ARGS, get_ffmpeg_path
 
 logger = logging.getLogger(__name__)
 
@@ -167,8 +167,8 @@ class FrameGeneratorV11:
    
     def _load_data(self, timestamps_path: Path) -> Tuple[List[WordTimestamp], List[Dict]]:
         logger.info(f"Loading data from: {timestamps_path}")
-        with open(timestamps_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # orjson parses straight from bytes, without building a decoded str of the whole file
+        data = orjson.loads(Path(timestamps_path).read_bytes())
         if not isinstance(data, dict) or "words" not in data or "segments" not in data:
             raise ValueError("Invalid timestamp format: expected 'words' and 'segments' keys")
         if not data["segments"]:
@@ -2137,22 +2137,6 @@ def _generate_frame_batch_worker(
     return generated_files
 
 
-def _get_ffmpeg_path() -> str:
-    """Get the path to ffmpeg executable."""
-    import shutil
-    try:
-        import imageio_ffmpeg
-        return imageio_ffmpeg.get_ffmpeg_exe()
-    except ImportError:
-        pass
-    
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path:
-        return ffmpeg_path
-    
-    raise FileNotFoundError("FFmpeg not found. Please install ffmpeg.")
-
-
 def _detect_hardware_codec() -> Tuple[str, List[str]]:
     """
     Detect available hardware acceleration codec.
@@ -2163,7 +2147,7 @@ def _detect_hardware_codec() -> Tuple[str, List[str]]:
     """
     import subprocess
     
-    ffmpeg_path = _get_ffmpeg_path()
+    ffmpeg_path = get_ffmpeg_path()
     
     # Try NVIDIA NVENC
     try:
@@ -2239,7 +2223,7 @@ def _encode_video_with_ffmpeg(
     """
     import subprocess
     
-    ffmpeg_path = _get_ffmpeg_path()
+    ffmpeg_path = get_ffmpeg_path()
     codec, codec_params = _detect_hardware_codec()
     
     # Use hardware encoding for temp file if available, otherwise use fastest software encoding
@@ -2292,6 +2276,7 @@ def _encode_video_with_ffmpeg(
         cmd = [
             ffmpeg_path,
             "-y",
+            *FFMPEG_QUIET_ARGS,
             "-i", str(temp_video),
             "-i", str(audio_path),
             "-c:v", codec,
@@ -2304,7 +2289,7 @@ def _encode_video_with_ffmpeg(
         
         logger.info(f"Encoding final video with {codec}...")
         try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            result = subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
             logger.info("Video encoding complete")
             return output_path
         except subprocess.CalledProcessError as e:
@@ -2317,6 +2302,7 @@ def _encode_video_with_ffmpeg(
                 cmd_software = [
                     ffmpeg_path,
                     "-y",
+                    *FFMPEG_QUIET_ARGS,
                     "-i", str(temp_video),
                     "-i", str(audio_path),
                     "-c:v", "libx264",
@@ -2327,7 +2313,7 @@ def _encode_video_with_ffmpeg(
                     "-shortest",
                     str(output_path)
                 ]
-                subprocess.run(cmd_software, check=True, capture_output=True, text=True)
+                subprocess.run(cmd_software, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
                 logger.info("Video encoding complete (using software encoder)")
                 return output_path
             else:
@@ -2487,7 +2473,7 @@ def render_video(
         import math
         import io
         
-        ffmpeg_path = _get_ffmpeg_path()
+        ffmpeg_path = get_ffmpeg_path()
         codec, codec_params = _detect_hardware_codec()
         
         # Create a function to generate frame at timestamp
@@ -2634,6 +2620,7 @@ def render_video(
         cmd = [
             ffmpeg_path,
             "-y",
+            *FFMPEG_QUIET_ARGS,
             "-f", "image2pipe",
             "-vcodec", "png",
             "-r", str(fps),
@@ -2661,7 +2648,7 @@ def render_video(
             process = subprocess.Popen(
                 cmd,
                 stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
                 bufsize=0
             )
@@ -2736,6 +2723,7 @@ def render_video(
                 cmd_software = [
                     ffmpeg_path,
                     "-y",
+                    *FFMPEG_QUIET_ARGS,
                     "-f", "image2pipe",
                     "-vcodec", "png",
                     "-r", str(fps),
@@ -2756,7 +2744,7 @@ def render_video(
                 process = subprocess.Popen(
                     cmd_software,
                     stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
                     stderr=subprocess.PIPE,
                     bufsize=0
                 )
@@ -92,6 +92,39 @@ def generate_reels_video_task(
     except Exception as e:
         logger.error(f"Reels task failed: {e}")
         return {"status": "failed", "error": str(e)}
+
+@celery_app.task(bind=True, name="generate_summary")
+def generate_summary_task(self, job_id: str):
+    try:
+        logger.info(f"Worker processing summary job: {job_id}")
+        pipeline_service.generate_summary(job_id=job_id)
+        return {"status": "success", "job_id": job_id}
+    except Exception as e:
+        logger.error(f"Summary task failed: {e}")
+        return {"status": "failed", "error": str(e)}
+
+@celery_app.task(bind=True, name="generate_summary_video")
+def generate_summary_video_task(
+    self, 
+    job_id: str, 
+    voice_provider: str, 
+    openai_voice: str = None, 
+    cartesia_voice_id: str = None, 
+    cartesia_model_id: str = None
+):
+    try:
+        logger.info(f"Worker processing summary video job: {job_id}")
+        pipeline_service.generate_summary_video(
+            job_id=job_id,
+            voice_provider=voice_provider,
+            openai_voice=openai_voice,
+            cartesia_voice_id=cartesia_voice_id,
+            cartesia_model_id=cartesia_model_id
+        )
+        return {"status": "success", "job_id": job_id}
+    except Exception as e:
+        logger.error(f"Summary video task failed: {e}")
+        return {"status": "failed", "error": str(e)}
     
 @celery_app.task(bind=True, name="generate_video_from_audio")
 def generate_video_from_audio_task(self, job_id: str, audio_path_str: str):
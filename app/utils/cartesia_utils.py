@@ -0,0 +1,45 @@
+"""
+Shared Cartesia SDK client construction.
+"""
+import functools
+import logging
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def get_cartesia_http_client() -> httpx.Client:
+    """
+    Process-wide pooled HTTP client for Cartesia.
+
+    Shared by the API service and every TTS CartesiaService, so TLS connections
+    stay warm across requests, chunks and jobs.
+    """
+    pool_size = settings.CARTESIA_POOL_SIZE
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=max(1, pool_size // 2),
+        ),
+        timeout=60,
+        follow_redirects=True
+    )
+
+
+def build_cartesia_client(cartesia_cls, api_key: str):
+    """
+    Create a Cartesia SDK client on the shared HTTP client when the SDK accepts one.
+
+    Args:
+        cartesia_cls: The cartesia.Cartesia class (callers import the SDK themselves)
+        api_key: Cartesia API key
+    """
+    try:
+        return cartesia_cls(api_key=api_key, httpx_client=get_cartesia_http_client())
+    except TypeError:
+        # Older SDK releases don't support injecting an HTTP client
+        return cartesia_cls(api_key=api_key)
@@ -0,0 +1,26 @@
+"""
+Shared ffmpeg helpers.
+"""
+import functools
+import shutil
+
+try:
+    import imageio_ffmpeg
+except ImportError:
+    imageio_ffmpeg = None
+
+# Keep ffmpeg's stderr to errors only, so captured output stays small and pipes never fill
+FFMPEG_QUIET_ARGS = ("-nostats", "-loglevel", "error")
+
+
+@functools.cache
+def get_ffmpeg_path() -> str:
+    """Get the path to ffmpeg executable (resolved once per process)."""
+    if imageio_ffmpeg is not None:
+        return imageio_ffmpeg.get_ffmpeg_exe()
+
+    ffmpeg_path = shutil.which("ffmpeg")
+    if ffmpeg_path:
+        return ffmpeg_path
+
+    raise FileNotFoundError("FFmpeg not found. Please install ffmpeg.")
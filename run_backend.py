@@ -1,14 +1,26 @@
 """
 Run the FastAPI backend server.
+
+Environment:
+    DEV=1       Auto-reload on code changes (single worker)
+    WORKERS=N   Number of worker processes (default 1)
+    HOST, PORT  Bind address (default 0.0.0.0:8000)
 """
+import os
+
 import uvicorn
 
 if __name__ == "__main__":
+    dev = os.getenv("DEV") == "1"
     uvicorn.run(
-        "app.api.main:app",  # Use import string for reload to work
-        host="0.0.0.0",
-        port=8000,
-        reload=True,  # Set to False in production
+        "app.api.main:app",  # Use import string for reload/workers to work
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        reload=dev,
+        # Each worker keeps its own in-memory job list, so more than one is opt-in
+        workers=1 if dev else int(os.getenv("WORKERS", "1")),
+        # "auto" picks uvloop and httptools when installed (not available on Windows)
+        loop="auto",
+        http="auto",
         log_level="info"
     )
-